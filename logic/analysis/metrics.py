@@ -1,57 +1,167 @@
+from dataclasses import dataclass
+
+import cv2
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from logic.vodProcessor.videoUtils import POSITION_DTYPE
+
+# Field order of the record array returned by CrosshairMetrics.detectFlicks
+FLICK_FIELDS = ("frameStart", "frameEnd", "distance", "velocity", "direction")
+
+def _directionOctant(dx, dy):
+    """
+    Bucket movement directions into octants with comparisons only (no trig).
+    
+    Bits: 4 = moving down (dy > 0), 2 = moving left (dx < 0),
+          1 = more vertical than horizontal (|dy| > |dx|)
+    
+    Returns:
+        int8 array of octant codes (0-7)
+    """
+    octant = (dy > 0).astype(np.int8) << 2
+    octant |= (dx < 0).astype(np.int8) << 1
+    octant |= np.abs(dy) > np.abs(dx)
+    return octant
+
+def _movementKernel(x, y, t, angleBucketOnly=False):
+    """
+    Compute the per-movement columns from position arrays.
+    Each column is produced by a single whole-array pass, reusing buffers
+    in place instead of allocating intermediate temporaries.
+    
+    Args:
+        x, y, t: Position x, y and timestamp arrays (same length)
+        angleBucketOnly: Return direction as an int8 octant code instead of degrees
+    
+    Returns:
+        (dx, dy, distance, timeDiff, velocity, direction) arrays of length len(x) - 1
+    """
+    # Coordinates may be stored as float32 (POSITION_DTYPE); do the kinematics in
+    # float64 so velocities that land exactly on a threshold compare as before
+    dx = np.diff(x.astype(np.float64))
+    dy = np.diff(y.astype(np.float64))
+    distance = np.hypot(dx, dy)
+    timeDiff = np.diff(t)
+    
+    # Velocity (pixels per second), 0 where time didn't advance
+    velocity = np.zeros_like(distance)
+    np.divide(distance, timeDiff, out=velocity, where=timeDiff > 0)
+    
+    if angleBucketOnly:
+        direction = _directionOctant(dx, dy)
+    else:
+        # Direction (angle in degrees), converted in place
+        direction = np.arctan2(dy, dx)
+        np.degrees(direction, out=direction)
+    
+    return dx, dy, distance, timeDiff, velocity, direction
+
+def _positionRecords(positions):
+    """
+    Pack positions into a POSITION_DTYPE structured array.
+    
+    Args:
+        positions: List of position dictionaries, or a structured array
+                   (returned unchanged)
+    
+    Returns:
+        Structured array with frameNumber, x, y and timestamp fields
+    """
+    if isinstance(positions, np.ndarray):
+        return positions
+    
+    return np.fromiter(
+        ((p["frameNumber"], p["x"], p["y"], p["timestamp"]) for p in positions),
+        dtype=POSITION_DTYPE,
+        count=len(positions)
+    )
+
+@dataclass(frozen=True)
+class _MovementStats:
+    """
+    Whole-session movement statistics, computed once per CrosshairMetrics.
+    """
+    totalDistance: float
+    averageVelocity: float
+    maxVelocity: float
+    smoothness: float
 
 class CrosshairMetrics:
     """
     Calculate performance metrics from crosshair tracking data.
     """
     
-    def __init__(self, positions):
+    def __init__(self, positions, angleBucketOnly=False):
         """
         Args:
-            positions: List of position dictionaries from tracking
+            positions: List of position dictionaries from tracking, or a NumPy
+                       structured array with POSITION_DTYPE fields
+                       (x, y, timestamp, frameNumber)
+            angleBucketOnly: Store movement direction as a cheap int8 octant code
+                             (see _directionOctant) instead of exact degrees.
+                             Use when direction is only needed for bucketing.
         """
-        self.positions = positions
+        self.angleBucketOnly = angleBucketOnly
+        
+        # Positions must not change: metrics below are cached
+        if isinstance(positions, np.ndarray):
+            # Structured array: use it directly (read-only view, no copy)
+            self.positions = positions.view()
+            self.positions.flags.writeable = False
+            records = self.positions
+        else:
+            self.positions = tuple(positions)
+            records = _positionRecords(self.positions)
+        
+        # Per-field column views of the records
+        self._x = records["x"]
+        self._y = records["y"]
+        self._t = records["timestamp"]
+        self._fn = records["frameNumber"]
+        
+        # Frame number -> position index, keeping the first occurrence of each frame.
+        # Tracked videos give non-decreasing frame numbers, so lookups can binary
+        # search the frame column; the dict is only built for unordered input
+        self._fnSorted = bool(np.all(self._fn[1:] >= self._fn[:-1]))
+        self._frameIndex = None
+        if not self._fnSorted:
+            self._frameIndex = {}
+            for i, frameNumber in enumerate(self._fn.tolist()):
+                self._frameIndex.setdefault(frameNumber, i)
+        
         self.movements = self._calculateMovements()
+        
+        # Flick masks, gathered flick columns and flick analyses keyed by velocity
+        # threshold (positions never change after init, so these never need invalidating)
+        self._flickCache = {}
+        self._flickViewCache = {}
+        self._flickAnalysisCache = {}
+        self._stats = None
+        self._summary = None
     
     def _calculateMovements(self):
         """
         Calculate movement vectors between consecutive positions.
         
         Returns:
-            List of movement dictionaries with distance, velocity, direction
+            Dictionary of equal-length arrays (one entry per movement) with
+            frameStart, frameEnd, distance, velocity, direction, dx, dy, timeDiff.
+            direction is in degrees, or an octant code when angleBucketOnly is set
         """
-        movements = []
+        dx, dy, distance, timeDiff, velocity, direction = _movementKernel(
+            self._x, self._y, self._t, self.angleBucketOnly)
         
-        for i in range(1, len(self.positions)):
-            prev = self.positions[i - 1]
-            curr = self.positions[i]
-            
-            # Calculate distance
-            dx = curr["x"] - prev["x"]
-            dy = curr["y"] - prev["y"]
-            distance = np.sqrt(dx**2 + dy**2)
-            
-            # Calculate time difference
-            timeDiff = curr["timestamp"] - prev["timestamp"]
-            
-            # Calculate velocity (pixels per second)
-            velocity = distance / timeDiff if timeDiff > 0 else 0
-            
-            # Calculate direction (angle in degrees)
-            direction = np.degrees(np.arctan2(dy, dx))
-            
-            movements.append({
-                "frameStart": prev["frameNumber"],
-                "frameEnd": curr["frameNumber"],
-                "distance": distance,
-                "velocity": velocity,
-                "direction": direction,
-                "dx": dx,
-                "dy": dy,
-                "timeDiff": timeDiff
-            })
-        
-        return movements
+        return {
+            "frameStart": self._fn[:-1],
+            "frameEnd": self._fn[1:],
+            "distance": distance,
+            "velocity": velocity,
+            "direction": direction,
+            "dx": dx,
+            "dy": dy,
+            "timeDiff": timeDiff
+        }
     
     def getAverageVelocity(self):
         """
@@ -60,11 +170,7 @@ class CrosshairMetrics:
         Returns:
             Average velocity in pixels/second
         """
-        if not self.movements:
-            return 0
-        
-        velocities = [m["velocity"] for m in self.movements]
-        return np.mean(velocities)
+        return self._computeStats().averageVelocity
     
     def getMaxVelocity(self):
         """
@@ -73,11 +179,7 @@ class CrosshairMetrics:
         Returns:
             Max velocity in pixels/second
         """
-        if not self.movements:
-            return 0
-        
-        velocities = [m["velocity"] for m in self.movements]
-        return np.max(velocities)
+        return self._computeStats().maxVelocity
     
     def getTotalDistance(self):
         """
@@ -86,10 +188,7 @@ class CrosshairMetrics:
         Returns:
             Total distance in pixels
         """
-        if not self.movements:
-            return 0
-        
-        return sum(m["distance"] for m in self.movements)
+        return self._computeStats().totalDistance
     
     def getSmoothness(self):
         """
@@ -99,13 +198,68 @@ class CrosshairMetrics:
         Returns:
             Smoothness score (standard deviation of velocity changes)
         """
-        if len(self.movements) < 2:
-            return 0
+        return self._computeStats().smoothness
+    
+    def _computeStats(self):
+        """
+        Compute the summary statistics once from the resident movement arrays.
+        All four come out of the same pass over the columns, so whichever getter
+        runs first fills the cache for the others.
         
-        velocities = [m["velocity"] for m in self.movements]
-        velocityChanges = [abs(velocities[i] - velocities[i-1]) for i in range(1, len(velocities))]
+        Returns:
+            _MovementStats instance (cached after the first call)
+        """
+        if self._stats is None:
+            velocities = self.movements["velocity"]
+            distances = self.movements["distance"]
+            
+            averageVelocity = maxVelocity = totalDistance = smoothness = 0.0
+            if velocities.size:
+                averageVelocity = float(velocities.mean(dtype=np.float64))
+                maxVelocity = float(velocities.max())
+                totalDistance = float(distances.sum(dtype=np.float64))
+            if velocities.size >= 2:
+                # Velocity changes built in one buffer (no separate abs temporary)
+                velocityChanges = np.subtract(velocities[1:], velocities[:-1])
+                np.abs(velocityChanges, out=velocityChanges)
+                smoothness = float(np.std(velocityChanges, dtype=np.float64))
+            
+            self._stats = _MovementStats(
+                totalDistance=totalDistance,
+                averageVelocity=averageVelocity,
+                maxVelocity=maxVelocity,
+                smoothness=smoothness
+            )
+        return self._stats
+    
+    def _flickMask(self, velocityThreshold):
+        """
+        Boolean mask over movements that exceed the flick velocity threshold.
+        Computed once per threshold and reused by every flick method.
+        """
+        mask = self._flickCache.get(velocityThreshold)
+        if mask is None:
+            mask = self.movements["velocity"] > velocityThreshold
+            self._flickCache[velocityThreshold] = mask
+        return mask
+    
+    def _flickColumns(self, velocityThreshold):
+        """
+        Movement columns gathered at the flick indices for a threshold.
+        Each column is fancy-indexed once and shared by every flick reporter.
         
-        return np.std(velocityChanges)
+        Returns:
+            Dictionary with index (into self.movements), frameStart, frameEnd,
+            distance, velocity and direction arrays
+        """
+        columns = self._flickViewCache.get(velocityThreshold)
+        if columns is None:
+            flickIndices = np.nonzero(self._flickMask(velocityThreshold))[0]
+            columns = {"index": flickIndices}
+            for key in FLICK_FIELDS:
+                columns[key] = self.movements[key][flickIndices]
+            self._flickViewCache[velocityThreshold] = columns
+        return columns
     
     def detectFlicks(self, velocityThreshold=2000):
         """
@@ -115,21 +269,15 @@ class CrosshairMetrics:
             velocityThreshold: Minimum velocity to be considered a flick (pixels/sec)
         
         Returns:
-            List of flick dictionaries with frame, distance, velocity
+            Record array with one row per flick and fields frameStart, frameEnd,
+            distance, velocity, direction (use recordsToDicts for a list of dicts)
         """
-        flicks = []
+        flicks = self._flickColumns(velocityThreshold)
         
-        for movement in self.movements:
-            if movement["velocity"] > velocityThreshold:
-                flicks.append({
-                    "frameStart": movement["frameStart"],
-                    "frameEnd": movement["frameEnd"],
-                    "distance": movement["distance"],
-                    "velocity": movement["velocity"],
-                    "direction": movement["direction"]
-                })
-        
-        return flicks
+        return np.rec.fromarrays(
+            [flicks[name] for name in FLICK_FIELDS],
+            names=FLICK_FIELDS
+        )
     
     def detectFlicksByDistance(self, velocityThreshold=2000):
         """
@@ -141,33 +289,77 @@ class CrosshairMetrics:
         - Large (300+px): Wide sweeps, corrections expected
         
         Returns:
-            Dictionary with flicks categorized by distance
+            Dictionary mapping each category to an array of movement indices
+            (index into self.movements columns)
         """
-        flicks = {
-            'small': [],   # 0-100px
-            'medium': [],  # 100-300px
-            'large': []    # 300+px
+        flicks = self._flickColumns(velocityThreshold)
+        flickIndices = flicks["index"]
+        
+        # Bucket 0 = <100px, 1 = 100-300px, 2 = 300+px
+        buckets = np.digitize(flicks["distance"], [100, 300])
+        
+        return {
+            'small': flickIndices[buckets == 0],
+            'medium': flickIndices[buckets == 1],
+            'large': flickIndices[buckets == 2]
         }
+    
+    def detectMicroAdjustments(self, minDistance=10, maxDistance=50, maxVelocity=1000):
+        """
+        Detect micro-adjustments (small, slower movements).
         
-        for movement in self.movements:
-            if movement["velocity"] > velocityThreshold:
-                distance = movement["distance"]
-                
-                flickData = {
-                    "frameStart": movement["frameStart"],
-                    "frameEnd": movement["frameEnd"],
-                    "distance": distance,
-                    "velocity": movement["velocity"]
-                }
-                
-                if distance < 100:
-                    flicks['small'].append(flickData)
-                elif distance < 300:
-                    flicks['medium'].append(flickData)
-                else:
-                    flicks['large'].append(flickData)
+        Args:
+            minDistance: Movements must be longer than this (pixels)
+            maxDistance: Movements must be shorter than this (pixels)
+            maxVelocity: Movements must be slower than this (pixels/sec)
+        
+        Returns:
+            Array of movement indices (index into self.movements columns)
+        """
+        distances = self.movements["distance"]
+        velocities = self.movements["velocity"]
         
-        return flicks
+        mask = (distances > minDistance) & (distances < maxDistance) & (velocities < maxVelocity)
+        return np.nonzero(mask)[0]
+    
+    def detectCorrections(self, velocityThreshold=1500, minAngle=np.pi / 2):
+        """
+        Detect corrections: direction reversals right after a fast movement.
+        
+        Args:
+            velocityThreshold: The preceding movement must be faster than this (pixels/sec)
+            minAngle: Minimum change in movement angle (radians) to count as a reversal
+        
+        Returns:
+            Array of indices of the correcting movements (index into self.movements columns)
+        """
+        m = self.movements
+        
+        # Angles from dx/dy rather than the direction column, which may hold octant codes
+        angles = np.arctan2(m["dy"], m["dx"])
+        angleDiff = np.abs(angles[1:] - angles[:-1])
+        
+        mask = (m["velocity"][:-1] > velocityThreshold) & (angleDiff > minAngle)
+        return np.nonzero(mask)[0] + 1
+    
+    def _findFrameIndices(self, frames):
+        """
+        Look up the first position index of each frame number.
+        
+        Args:
+            frames: Array of frame numbers
+        
+        Returns:
+            Array of position indices, -1 where a frame was not tracked
+        """
+        if self._fnSorted:
+            # side='left' lands on the first of any repeated frame numbers
+            indices = np.searchsorted(self._fn, frames)
+            found = indices < self._fn.size
+            found[found] = self._fn[indices[found]] == frames[found]
+            return np.where(found, indices, -1)
+        
+        return np.array([self._frameIndex.get(f, -1) for f in frames.tolist()], dtype=np.intp)
     
     def analyzeFlickCorrections(self, flickFrame, lookAheadFrames=10):
         """
@@ -181,70 +373,101 @@ class CrosshairMetrics:
             Dictionary with correction metrics
         """
         # Find the flick position in our data
-        flickIndex = None
-        for i, pos in enumerate(self.positions):
-            if pos["frameNumber"] == flickFrame:
-                flickIndex = i
-                break
+        flickIndex = int(self._findFrameIndices(np.array([flickFrame]))[0])
         
-        if flickIndex is None or flickIndex + lookAheadFrames >= len(self.positions):
+        if flickIndex < 0 or flickIndex + lookAheadFrames >= len(self.positions):
             return None
         
-        # Get positions after the flick
-        postFlickPositions = self.positions[flickIndex:flickIndex + lookAheadFrames + 1]
+        # Step distances after the flick (movement i spans positions i -> i+1)
+        stepDistances = self.movements["distance"][flickIndex:flickIndex + lookAheadFrames]
         
-        # Calculate total correction distance
-        correctionDistance = 0
-        correctionCount = 0
-        directionChanges = 0
+        # Count as correction if moving more than 2 pixels
+        correctionMask = stepDistances > 2
+        correctionDistance = float(stepDistances[correctionMask].sum(dtype=np.float64))
+        correctionCount = int(correctionMask.sum())
         
-        for i in range(1, len(postFlickPositions)):
-            prev = postFlickPositions[i - 1]
-            curr = postFlickPositions[i]
-            
-            dx = curr["x"] - prev["x"]
-            dy = curr["y"] - prev["y"]
-            distance = np.sqrt(dx**2 + dy**2)
-            
-            # Count as correction if moving more than 2 pixels
-            if distance > 2:
-                correctionDistance += distance
-                correctionCount += 1
-        
-        # Calculate time to stabilize (when movement drops below threshold)
-        stabilizationTime = None
-        for i in range(1, len(postFlickPositions)):
-            prev = postFlickPositions[i - 1]
-            curr = postFlickPositions[i]
-            
-            dx = curr["x"] - prev["x"]
-            dy = curr["y"] - prev["y"]
-            distance = np.sqrt(dx**2 + dy**2)
-            
-            # Stabilized when movement < 2 pixels for 3 consecutive frames
-            if distance < 2:
-                if stabilizationTime is None:
-                    stabilizationTime = curr["timestamp"] - postFlickPositions[0]["timestamp"]
+        # Time to stabilize: first step where movement drops below 2 pixels,
+        # falling back to the whole look-ahead window
+        stabilizationTime = 0
+        stableSteps = np.nonzero(stepDistances < 2)[0]
+        if stableSteps.size:
+            stabilizationTime = self._t[flickIndex + stableSteps[0] + 1] - self._t[flickIndex]
+        if not stabilizationTime:
+            stabilizationTime = self._t[flickIndex + lookAheadFrames] - self._t[flickIndex]
         
         return {
             "correctionDistance": correctionDistance,
             "correctionCount": correctionCount,
-            "stabilizationTime": stabilizationTime if stabilizationTime else (postFlickPositions[-1]["timestamp"] - postFlickPositions[0]["timestamp"])
+            "stabilizationTime": float(stabilizationTime)
         }
         
+    def _flickCorrectionsBatch(self, flickFrames, lookAheadFrames=10):
+        """
+        Vectorized analyzeFlickCorrections over many flicks at once.
+        
+        Args:
+            flickFrames: Array of frame numbers where flicks occurred
+            lookAheadFrames: How many frames to analyze after each flick
+        
+        Returns:
+            Tuple (valid, correctionDistance, correctionCount, stabilizationTime) of
+            arrays aligned with flickFrames; rows where valid is False had no
+            full look-ahead window and hold no data
+        """
+        flickIndex = self._findFrameIndices(flickFrames)
+        valid = (flickIndex >= 0) & (flickIndex + lookAheadFrames < len(self.positions))
+        starts = flickIndex[valid]
+        
+        # One row of step distances per flick: movements start .. start+lookAhead-1.
+        # Rows come from a strided window view, so no (flicks x lookAhead) index
+        # matrix is built; valid rows guarantee the distance column is long enough
+        distance = self.movements["distance"]
+        if starts.size:
+            stepDistances = sliding_window_view(distance, lookAheadFrames)[starts]
+        else:
+            stepDistances = np.empty((0, lookAheadFrames), dtype=distance.dtype)
+        
+        correctionMask = stepDistances > 2
+        correctionDistance = np.where(correctionMask, stepDistances, 0).sum(axis=1, dtype=np.float64)
+        correctionCount = correctionMask.sum(axis=1)
+        
+        # First stable step per row (argmax of a bool row finds the first True)
+        stableMask = stepDistances < 2
+        hasStable = stableMask.any(axis=1)
+        firstStable = stableMask.argmax(axis=1)
+        t = self._t
+        stabilizationTime = np.where(hasStable, t[starts + firstStable + 1] - t[starts], 0.0)
+        stabilizationTime = np.where(stabilizationTime != 0, stabilizationTime,
+                                     t[starts + lookAheadFrames] - t[starts])
+        
+        return valid, correctionDistance, correctionCount, stabilizationTime
+        
     def getFlickAnalysisByDistance(self, velocityThreshold=2000):
         """
         Get comprehensive flick analysis categorized by distance.
         
         Returns:
             Dictionary with statistics for small, medium, and large flicks
+            (computed once per threshold; each call returns a fresh copy)
         """
-        flicksByDistance = self.detectFlicksByDistance(velocityThreshold)
+        analysis = self._flickAnalysisCache.get(velocityThreshold)
+        if analysis is not None:
+            return {category: dict(stats) for category, stats in analysis.items()}
+        
+        flicks = self._flickColumns(velocityThreshold)
+        buckets = np.digitize(flicks["distance"], [100, 300])
+        
+        # Corrections for every flick in one batch, then sliced per category
+        valid, correctionDistance, correctionCount, stabilizationTime = \
+            self._flickCorrectionsBatch(flicks["frameEnd"])
+        validBuckets = buckets[valid]
         
         analysis = {}
         
-        for category, flicks in flicksByDistance.items():
-            if not flicks:
+        for bucket, category in enumerate(('small', 'medium', 'large')):
+            inBucket = buckets == bucket
+            count = int(np.count_nonzero(inBucket))
+            if count == 0:
                 analysis[category] = {
                     "count": 0,
                     "avgDistance": 0,
@@ -255,145 +478,24 @@ class CrosshairMetrics:
                 }
                 continue
             
-            # Analyze corrections for each flick
-            corrections = []
-            for flick in flicks:
-                correctionData = self.analyzeFlickCorrections(flick["frameEnd"])
-                if correctionData:
-                    corrections.append(correctionData)
-            
-            # Calculate averages
-            avgCorrectionCount = np.mean([c["correctionCount"] for c in corrections]) if corrections else 0
-            avgCorrectionDistance = np.mean([c["correctionDistance"] for c in corrections]) if corrections else 0
-            avgStabilizationTime = np.mean([c["stabilizationTime"] for c in corrections]) if corrections else 0
+            # Calculate averages over the flicks that had a full look-ahead window
+            analyzed = validBuckets == bucket
+            hasCorrections = analyzed.any()
+            avgCorrectionCount = np.mean(correctionCount[analyzed]) if hasCorrections else 0
+            avgCorrectionDistance = np.mean(correctionDistance[analyzed]) if hasCorrections else 0
+            avgStabilizationTime = np.mean(stabilizationTime[analyzed]) if hasCorrections else 0
             
             analysis[category] = {
-                "count": len(flicks),
-                "avgDistance": np.mean([f["distance"] for f in flicks]),
-                "avgVelocity": np.mean([f["velocity"] for f in flicks]),
+                "count": count,
+                "avgDistance": float(flicks["distance"][inBucket].mean(dtype=np.float64)),
+                "avgVelocity": float(flicks["velocity"][inBucket].mean(dtype=np.float64)),
                 "avgCorrectionCount": avgCorrectionCount,
                 "avgCorrectionDistance": avgCorrectionDistance,
                 "avgStabilizationTime": avgStabilizationTime
             }
         
-        return analysis
-    
-    def analyzeFlickAccuracyWithTargets(videoPath, crosshairPositions, targetDetector, velocityThreshold=2000):
-        """
-        Analyze flick accuracy by detecting targets with YOLO.
-        
-        Args:
-            videoPath: Path to video file
-            crosshairPositions: List of crosshair tracking data
-            targetDetector: TargetDetector instance
-            velocityThreshold: Minimum velocity to consider a flick
-        
-        Returns:
-            Dictionary with overshoot/undershoot statistics
-        """
-        cap = cv2.VideoCapture(videoPath)
-        
-        flickResults = {
-            'overshoot': [],
-            'undershoot': [],
-            'on-target': []
-        }
-        
-        print("Analyzing flick accuracy with target detection...")
-        
-        for i in range(1, len(crosshairPositions)):
-            prev = crosshairPositions[i-1]
-            curr = crosshairPositions[i]
-            
-            # Calculate velocity
-            dx = curr["x"] - prev["x"]
-            dy = curr["y"] - prev["y"]
-            distance = np.sqrt(dx**2 + dy**2)
-            timeDiff = curr["timestamp"] - prev["timestamp"]
-            velocity = distance / timeDiff if timeDiff > 0 else 0
-            
-            # Check if this is a flick
-            if velocity > velocityThreshold:
-                # Get frame at flick endpoint
-                cap.set(cv2.CAP_PROP_POS_FRAMES, curr["frameNumber"])
-                ret, frame = cap.read()
-                
-                if not ret:
-                    continue
-                
-                # Detect targets in frame
-                targets = targetDetector.detectHeads(frame)
-                
-                if not targets:
-                    continue
-                
-                # Find nearest target to crosshair endpoint
-                crosshairPos = (curr["x"], curr["y"])
-                nearestTarget = targetDetector.findNearestTarget(crosshairPos, targets)
-                
-                if not nearestTarget:
-                    continue
-                
-                # Calculate flick accuracy
-                # Vector from start position to target
-                targetDx = nearestTarget['x'] - prev["x"]
-                targetDy = nearestTarget['y'] - prev["y"]
-                distanceToTarget = np.sqrt(targetDx**2 + targetDy**2)
-                
-                # Vector from start position to crosshair endpoint
-                flickDx = curr["x"] - prev["x"]
-                flickDy = curr["y"] - prev["y"]
-                flickDistance = np.sqrt(flickDx**2 + flickDy**2)
-                
-                # Project crosshair endpoint onto target direction
-                if distanceToTarget > 0:
-                    dotProduct = (flickDx * targetDx + flickDy * targetDy)
-                    projection = dotProduct / distanceToTarget
-                    
-                    # Error = how much we over/undershot
-                    error = projection - distanceToTarget
-                    
-                    flickData = {
-                        'frameNumber': curr["frameNumber"],
-                        'error': error,
-                        'distanceToTarget': distanceToTarget,
-                        'flickDistance': flickDistance,
-                        'targetConfidence': nearestTarget['confidence']
-                    }
-                    
-                    # Categorize
-                    if error > 15:  # Overshot by >15 pixels
-                        flickResults['overshoot'].append(flickData)
-                    elif error < -15:  # Undershot by >15 pixels
-                        flickResults['undershoot'].append(flickData)
-                    else:  # Within 15 pixels = on-target
-                        flickResults['on-target'].append(flickData)
-                
-                # Progress indicator
-                if i % 100 == 0:
-                    print(f"Processed {i}/{len(crosshairPositions)} positions...")
-        
-        cap.release()
-        
-        # Calculate statistics
-        totalFlicks = sum(len(v) for v in flickResults.values())
-        
-        if totalFlicks == 0:
-            return None
-        
-        stats = {
-            'totalFlicks': totalFlicks,
-            'overshootCount': len(flickResults['overshoot']),
-            'undershootCount': len(flickResults['undershoot']),
-            'onTargetCount': len(flickResults['on-target']),
-            'overshootPercent': len(flickResults['overshoot']) / totalFlicks * 100,
-            'undershootPercent': len(flickResults['undershoot']) / totalFlicks * 100,
-            'onTargetPercent': len(flickResults['on-target']) / totalFlicks * 100,
-            'avgOvershootError': np.mean([f['error'] for f in flickResults['overshoot']]) if flickResults['overshoot'] else 0,
-            'avgUndershootError': np.mean([abs(f['error']) for f in flickResults['undershoot']]) if flickResults['undershoot'] else 0
-        }
-        
-        return stats
+        self._flickAnalysisCache[velocityThreshold] = analysis
+        return {category: dict(stats) for category, stats in analysis.items()}
     
     def getFlickStats(self, velocityThreshold=2000):
         """
@@ -402,9 +504,9 @@ class CrosshairMetrics:
         Returns:
             Dictionary with flick count, average distance, average velocity
         """
-        flicks = self.detectFlicks(velocityThreshold)
+        flicks = self._flickColumns(velocityThreshold)
         
-        if not flicks:
+        if flicks["index"].size == 0:
             return {
                 "count": 0,
                 "averageDistance": 0,
@@ -413,44 +515,15 @@ class CrosshairMetrics:
                 "maxVelocity": 0
             }
         
-        distances = [f["distance"] for f in flicks]
-        velocities = [f["velocity"] for f in flicks]
+        distances = flicks["distance"]
+        velocities = flicks["velocity"]
         
         return {
-            "count": len(flicks),
-            "averageDistance": np.mean(distances),
-            "averageVelocity": np.mean(velocities),
-            "maxDistance": np.max(distances),
-            "maxVelocity": np.max(velocities)
-        }
-    
-    def getFlickStats(self, velocityThreshold=2000):
-        """
-        Get statistics about flicks.
-        
-        Returns:
-            Dictionary with flick count, average distance, average velocity
-        """
-        flicks = self.detectFlicks(velocityThreshold)
-        
-        if not flicks:
-            return {
-                "count": 0,
-                "averageDistance": 0,
-                "averageVelocity": 0,
-                "maxDistance": 0,
-                "maxVelocity": 0
-            }
-        
-        distances = [f["distance"] for f in flicks]
-        velocities = [f["velocity"] for f in flicks]
-        
-        return {
-            "count": len(flicks),
-            "averageDistance": np.mean(distances),
-            "averageVelocity": np.mean(velocities),
-            "maxDistance": np.max(distances),
-            "maxVelocity": np.max(velocities)
+            "count": int(distances.size),
+            "averageDistance": float(distances.mean(dtype=np.float64)),
+            "averageVelocity": float(velocities.mean(dtype=np.float64)),
+            "maxDistance": float(distances.max()),
+            "maxVelocity": float(velocities.max())
         }
     
     def getTrackingSegments(self, velocityThreshold=500):
@@ -464,41 +537,41 @@ class CrosshairMetrics:
         Returns:
             List of tracking segment dictionaries
         """
-        trackingSegments = []
-        currentSegment = []
-        
-        for i, movement in enumerate(self.movements):
-            if movement["velocity"] <= velocityThreshold and movement["distance"] > 5:
-                # This is tracking movement
-                currentSegment.append(i)
-            else:
-                # End of tracking segment
-                if len(currentSegment) >= 3:  # At least 3 consecutive tracking movements
-                    totalDistance = sum(self.movements[j]["distance"] for j in currentSegment)
-                    avgVelocity = np.mean([self.movements[j]["velocity"] for j in currentSegment])
-                    
-                    trackingSegments.append({
-                        "startFrame": self.movements[currentSegment[0]]["frameStart"],
-                        "endFrame": self.movements[currentSegment[-1]]["frameEnd"],
-                        "duration": len(currentSegment),
-                        "distance": totalDistance,
-                        "avgVelocity": avgVelocity
-                    })
-                
-                currentSegment = []
-        
-        # Handle last segment
-        if len(currentSegment) >= 3:
-            totalDistance = sum(self.movements[j]["distance"] for j in currentSegment)
-            avgVelocity = np.mean([self.movements[j]["velocity"] for j in currentSegment])
-            
-            trackingSegments.append({
-                "startFrame": self.movements[currentSegment[0]]["frameStart"],
-                "endFrame": self.movements[currentSegment[-1]]["frameEnd"],
-                "duration": len(currentSegment),
-                "distance": totalDistance,
-                "avgVelocity": avgVelocity
-            })
+        velocities = self.movements["velocity"]
+        distances = self.movements["distance"]
+        
+        # Run-length encode the tracking mask: +1 edges start a run, -1 edges end it
+        isTracking = (velocities <= velocityThreshold) & (distances > 5)
+        edges = np.diff(np.concatenate(([0], isTracking.astype(np.int8), [0])))
+        starts = np.nonzero(edges == 1)[0]
+        ends = np.nonzero(edges == -1)[0]
+        
+        # At least 3 consecutive tracking movements
+        keep = (ends - starts) >= 3
+        starts = starts[keep]
+        ends = ends[keep]
+        
+        if starts.size == 0:
+            return []
+        
+        # Per-run sums: reduceat over [start, end) pairs, padded so end can hit len
+        bounds = np.column_stack((starts, ends)).ravel()
+        distanceSums = np.add.reduceat(np.append(distances, 0), bounds, dtype=np.float64)[::2]
+        velocitySums = np.add.reduceat(np.append(velocities, 0), bounds, dtype=np.float64)[::2]
+        lengths = ends - starts
+        
+        trackingSegments = [
+            {
+                "startFrame": int(startFrame),
+                "endFrame": int(endFrame),
+                "duration": int(length),
+                "distance": float(distanceSum),
+                "avgVelocity": float(velocitySum / length)
+            }
+            for startFrame, endFrame, length, distanceSum, velocitySum in zip(
+                self.movements["frameStart"][starts], self.movements["frameEnd"][ends - 1],
+                lengths, distanceSums, velocitySums)
+        ]
         
         return trackingSegments
     
@@ -508,22 +581,29 @@ class CrosshairMetrics:
         
         Returns:
             Dictionary with all calculated metrics
+            (computed once; each call returns a fresh copy)
         """
+        if self._summary is not None:
+            return dict(self._summary, flicks=dict(self._summary["flicks"]))
+        
+        stats = self._computeStats()
         flickStats = self.getFlickStats(velocityThreshold=2000)  # Changed from 500 to 2000
         trackingSegments = self.getTrackingSegments()
         
-        return {
+        self._summary = {
             "totalFrames": len(self.positions),
-            "totalDistance": self.getTotalDistance(),
-            "averageVelocity": self.getAverageVelocity(),
-            "maxVelocity": self.getMaxVelocity(),
-            "smoothness": self.getSmoothness(),
+            "totalDistance": stats.totalDistance,
+            "averageVelocity": stats.averageVelocity,
+            "maxVelocity": stats.maxVelocity,
+            "smoothness": stats.smoothness,
             "flicks": flickStats,
             "trackingSegmentCount": len(trackingSegments),
             "totalTrackingDistance": sum(seg["distance"] for seg in trackingSegments) if trackingSegments else 0
         }
+        return dict(self._summary, flicks=dict(self._summary["flicks"]))
         
-def analyzeFlickAccuracyWithTargets(videoPath, crosshairPositions, targetDetector, velocityThreshold=2000):
+def analyzeFlickAccuracyWithTargets(videoPath, crosshairPositions, targetDetector, velocityThreshold=2000, batchSize=16,
+                                    detectionCache=None):
     """
     Analyze flick accuracy by detecting targets with YOLO.
     
@@ -532,113 +612,127 @@ def analyzeFlickAccuracyWithTargets(videoPath, crosshairPositions, targetDetecto
         crosshairPositions: List of crosshair tracking data
         targetDetector: TargetDetector instance
         velocityThreshold: Minimum velocity to consider a flick
+        batchSize: Number of flick frames sent to the detector per call
+        detectionCache: Optional dict of frameNumber -> detected targets. Pass the
+                        same dict to repeated calls on one video (e.g. a threshold
+                        sweep) so each frame is only decoded and run through YOLO once
     
     Returns:
         Dictionary with overshoot/undershoot statistics
     """
-    import cv2
-    import numpy as np
-    
-    cap = cv2.VideoCapture(videoPath)
-    
-    flickResults = {
-        'overshoot': [],
-        'undershoot': [],
-        'on-target': []
-    }
-    
     print("Analyzing flick accuracy with target detection...")
     
-    for i in range(1, len(crosshairPositions)):
+    # Collect flick endpoints first, grouped by the frame they land on.
+    # Only velocities are needed, so run the movement kernel on the position columns
+    # (octant directions skip the arctan); movement k ends at position k + 1
+    records = _positionRecords(crosshairPositions)
+    velocity = _movementKernel(records["x"], records["y"], records["timestamp"], angleBucketOnly=True)[4]
+    flickIndices = np.nonzero(velocity > velocityThreshold)[0] + 1
+    
+    flicksByFrame = {}
+    for i in flickIndices.tolist():
         prev = crosshairPositions[i-1]
         curr = crosshairPositions[i]
-        
-        # Calculate velocity
-        dx = curr["x"] - prev["x"]
-        dy = curr["y"] - prev["y"]
-        distance = np.sqrt(dx**2 + dy**2)
-        timeDiff = curr["timestamp"] - prev["timestamp"]
-        velocity = distance / timeDiff if timeDiff > 0 else 0
-        
-        # Check if this is a flick
-        if velocity > velocityThreshold:
-            # Get frame at flick endpoint
-            cap.set(cv2.CAP_PROP_POS_FRAMES, curr["frameNumber"])
-            ret, frame = cap.read()
+        flicksByFrame.setdefault(int(curr["frameNumber"]), []).append((i, prev, curr))
+    
+    if detectionCache is None:
+        detectionCache = {}
+    
+    flickFrames = sorted(flicksByFrame)
+    framesToDetect = [flickFrame for flickFrame in flickFrames if flickFrame not in detectionCache]
+    
+    # Read the video in one forward pass: grab() skips frames without decoding,
+    # so only uncached flick endpoint frames are decoded (no per-flick keyframe seeks)
+    cap = cv2.VideoCapture(videoPath)
+    framePosition = 0
+    
+    for batchStart in range(0, len(framesToDetect), batchSize):
+        # Phase 1: decode the next batch of flick endpoint frames
+        batchFrameNumbers = []
+        batchFrames = []
+        for flickFrame in framesToDetect[batchStart:batchStart + batchSize]:
+            while framePosition < flickFrame and cap.grab():
+                framePosition += 1
             
-            if not ret:
-                continue
+            if framePosition != flickFrame:
+                break
             
-            # Detect targets in frame
-            targets = targetDetector.detectHeads(frame)
+            ret, frame = cap.read()
+            framePosition += 1
             
-            if not targets:
-                continue
+            if not ret:
+                break
             
+            batchFrameNumbers.append(flickFrame)
+            batchFrames.append(frame)
+        
+        if not batchFrames:
+            break
+        
+        # Phase 2: detect targets in the whole batch with one model call
+        batchTargets = targetDetector.detectHeadsBatch(batchFrames)
+        detectionCache.update(zip(batchFrameNumbers, batchTargets))
+    
+    cap.release()
+    
+    # Start, end and matched target points of every scored flick
+    startPoints = []
+    endPoints = []
+    targetPoints = []
+    
+    # Phase 3: match every flick to the nearest target on the frame it lands on
+    for flickFrame in flickFrames:
+        targets = detectionCache.get(flickFrame)
+        if not targets:
+            continue
+        
+        for i, prev, curr in flicksByFrame[flickFrame]:
             # Find nearest target to crosshair endpoint
             crosshairPos = (curr["x"], curr["y"])
             nearestTarget = targetDetector.findNearestTarget(crosshairPos, targets)
             
-            if not nearestTarget:
-                continue
-            
-            # Calculate flick accuracy
-            # Vector from start position to target
-            targetDx = nearestTarget['x'] - prev["x"]
-            targetDy = nearestTarget['y'] - prev["y"]
-            distanceToTarget = np.sqrt(targetDx**2 + targetDy**2)
-            
-            # Vector from start position to crosshair endpoint
-            flickDx = curr["x"] - prev["x"]
-            flickDy = curr["y"] - prev["y"]
-            flickDistance = np.sqrt(flickDx**2 + flickDy**2)
-            
-            # Project crosshair endpoint onto target direction
-            if distanceToTarget > 0:
-                dotProduct = (flickDx * targetDx + flickDy * targetDy)
-                projection = dotProduct / distanceToTarget
-                
-                # Error = how much we over/undershot
-                error = projection - distanceToTarget
-                
-                flickData = {
-                    'frameNumber': curr["frameNumber"],
-                    'error': error,
-                    'distanceToTarget': distanceToTarget,
-                    'flickDistance': flickDistance,
-                    'targetConfidence': nearestTarget['confidence']
-                }
-                
-                # Categorize
-                if error > 15:  # Overshot by >15 pixels
-                    flickResults['overshoot'].append(flickData)
-                elif error < -15:  # Undershot by >15 pixels
-                    flickResults['undershoot'].append(flickData)
-                else:  # Within 15 pixels = on-target
-                    flickResults['on-target'].append(flickData)
+            if nearestTarget:
+                startPoints.append((prev["x"], prev["y"]))
+                endPoints.append(crosshairPos)
+                targetPoints.append((nearestTarget['x'], nearestTarget['y']))
             
             # Progress indicator
             if i % 100 == 0:
                 print(f"Processed {i}/{len(crosshairPositions)} positions...")
     
-    cap.release()
+    # Calculate flick accuracy for all matched flicks at once
+    startPoints = np.asarray(startPoints, dtype=np.float64).reshape(-1, 2)
+    targetVectors = np.asarray(targetPoints, dtype=np.float64).reshape(-1, 2) - startPoints
+    flickVectors = np.asarray(endPoints, dtype=np.float64).reshape(-1, 2) - startPoints
+    distanceToTarget = np.hypot(targetVectors[:, 0], targetVectors[:, 1])
+    
+    # Project crosshair endpoint onto target direction
+    valid = distanceToTarget > 0
+    projection = np.einsum('ij,ij->i', flickVectors[valid], targetVectors[valid]) / distanceToTarget[valid]
+    
+    # Error = how much we over/undershot
+    error = projection - distanceToTarget[valid]
+    
+    # Categorize: 0 = overshot by >15px, 1 = undershot by >15px, 2 = on-target
+    category = np.select([error > 15, error < -15], [0, 1], default=2)
+    overshootCount, undershootCount, onTargetCount = np.bincount(category, minlength=3).tolist()
     
     # Calculate statistics
-    totalFlicks = sum(len(v) for v in flickResults.values())
+    totalFlicks = int(error.size)
     
     if totalFlicks == 0:
         return None
     
     stats = {
         'totalFlicks': totalFlicks,
-        'overshootCount': len(flickResults['overshoot']),
-        'undershootCount': len(flickResults['undershoot']),
-        'onTargetCount': len(flickResults['on-target']),
-        'overshootPercent': len(flickResults['overshoot']) / totalFlicks * 100,
-        'undershootPercent': len(flickResults['undershoot']) / totalFlicks * 100,
-        'onTargetPercent': len(flickResults['on-target']) / totalFlicks * 100,
-        'avgOvershootError': np.mean([f['error'] for f in flickResults['overshoot']]) if flickResults['overshoot'] else 0,
-        'avgUndershootError': np.mean([abs(f['error']) for f in flickResults['undershoot']]) if flickResults['undershoot'] else 0
+        'overshootCount': overshootCount,
+        'undershootCount': undershootCount,
+        'onTargetCount': onTargetCount,
+        'overshootPercent': overshootCount / totalFlicks * 100,
+        'undershootPercent': undershootCount / totalFlicks * 100,
+        'onTargetPercent': onTargetCount / totalFlicks * 100,
+        'avgOvershootError': float(error[category == 0].mean()) if overshootCount else 0,
+        'avgUndershootError': float(np.abs(error[category == 1]).mean()) if undershootCount else 0
     }
     
     return stats
\ No newline at end of file
@@ -8,54 +8,131 @@ sys.path.insert(0, projectRoot)
 import cv2
 import numpy as np
 
-def detectCrosshair(frame, crosshairColorLower, crosshairColorUpper, roiSize=200):
+from logic.vodProcessor.videoUtils import POSITION_DTYPE, FrameReader, FrameWriter
+
+# Fewer in-range ROI pixels than this is treated as noise rather than a crosshair
+MIN_BLOB_PIXELS = 5
+
+def getRoiBounds(width, height, roiSize):
     """
-    Detect crosshair position in a single frame using color-based detection.
-    Only searches in the center region of the frame to avoid gun skin interference.
+    Get the square region of interest centered on the screen.
     
     Args:
-        frame: BGR image from video
-        crosshairColorLower: Lower bound for crosshair color (BGR tuple)
-        crosshairColorUpper: Upper bound for crosshair color (BGR tuple)
-        roiSize: Size of the region of interest (square centered on screen)
+        width: Frame width in pixels
+        height: Frame height in pixels
+        roiSize: Size of the region of interest
     
     Returns:
-        (x, y) tuple of crosshair center, or None if not found
+        (x1, y1, x2, y2) slice bounds clamped to the frame
     """
-    height, width = frame.shape[:2]
     centerX = width // 2
     centerY = height // 2
     
-    # Define ROI (Region of Interest) - square box around screen center
     halfRoi = roiSize // 2
     x1 = max(0, centerX - halfRoi)
     y1 = max(0, centerY - halfRoi)
     x2 = min(width, centerX + halfRoi)
     y2 = min(height, centerY + halfRoi)
     
-    # Extract ROI
-    roi = frame[y1:y2, x1:x2]
+    return (x1, y1, x2, y2)
+
+def detectCrosshair(frame, crosshairColorLower, crosshairColorUpper, roiSize=200, singleBlob=False,
+                    downsample=1):
+    """
+    Detect crosshair position in a single frame using color-based detection.
+    Only searches in the center region of the frame to avoid gun skin interference.
+    
+    Args:
+        frame: BGR image from video
+        crosshairColorLower: Lower bound for crosshair color (BGR tuple)
+        crosshairColorUpper: Upper bound for crosshair color (BGR tuple)
+        roiSize: Size of the region of interest (square centered on screen)
+        singleBlob: Set when the crosshair is the only thing matching the color in
+                    the ROI; the centroid is then taken straight from the mask's
+                    pixel moments, skipping connected-component labelling
+        downsample: Search a 1/N-scale copy of the ROI (N*N fewer pixels to test);
+                    the result is only accurate to about N pixels, and thin
+                    crosshair lines shrink, so stray blobs can win the
+                    largest-blob test more easily
     
-    # Create mask for crosshair color in ROI only
-    mask = cv2.inRange(roi, crosshairColorLower, crosshairColorUpper)
+    Returns:
+        (x, y) tuple of crosshair center, or None if not found
+    """
+    height, width = frame.shape[:2]
     
-    # Find contours in the mask
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # Define ROI (Region of Interest) - square box around screen center
+    x1, y1, x2, y2 = getRoiBounds(width, height, roiSize)
     
-    if not contours:
-        return None
+    return detectCrosshairROI(frame[y1:y2, x1:x2], crosshairColorLower, crosshairColorUpper, x1, y1,
+                              singleBlob, downsample)
+
+def detectCrosshairROI(roi, crosshairColorLower, crosshairColorUpper, x1, y1, singleBlob=False, downsample=1,
+                       mask=None, labels=None):
+    """
+    Detect the crosshair in an already-extracted region of interest.
+    Lets video loops compute the ROI bounds once instead of per frame.
     
-    # Find the largest contour (most likely the crosshair)
-    largestContour = max(contours, key=cv2.contourArea)
+    Args:
+        roi: BGR image slice (frame[y1:y2, x1:x2])
+        crosshairColorLower: Lower bound for crosshair color (BGR tuple)
+        crosshairColorUpper: Upper bound for crosshair color (BGR tuple)
+        x1: Left edge of the ROI in the full frame
+        y1: Top edge of the ROI in the full frame
+        singleBlob: See detectCrosshair
+        downsample: See detectCrosshair
+        mask: Optional preallocated uint8 buffer (ROI height x width after
+              downsampling) that receives the color mask instead of a new array
+        labels: Optional preallocated int32 buffer (same shape as mask) for the
+                connected-component labels
     
-    # Calculate the center of the contour
-    moments = cv2.moments(largestContour)
-    if moments["m00"] == 0:
+    Returns:
+        (x, y) tuple of crosshair center in full frame coordinates, or None if not found
+    """
+    if downsample > 1:
+        # Nearest-neighbour keeps exact pixel colors; INTER_AREA would blend the
+        # thin crosshair lines into the background and push them out of range
+        roi = cv2.resize(roi, (max(1, roi.shape[1] // downsample), max(1, roi.shape[0] // downsample)),
+                         interpolation=cv2.INTER_NEAREST)
+    
+    # Create mask for crosshair color in ROI only.
+    # inRange is a vectorized compare in OpenCV; a 256^3 colour lookup table
+    # gathered with NumPy measured ~10x slower on an 800px ROI, so it stays.
+    mask = cv2.inRange(roi, crosshairColorLower, crosshairColorUpper, dst=mask)
+    
+    # Cheap early exit for frames with no (or only a few noise) matching pixels,
+    # e.g. menus or muzzle flashes, before any blob extraction
+    if cv2.countNonZero(mask) < MIN_BLOB_PIXELS:
         return None
     
-    # Convert ROI coordinates back to full frame coordinates
-    roiCenterX = int(moments["m10"] / moments["m00"])
-    roiCenterY = int(moments["m01"] / moments["m00"])
+    if singleBlob:
+        # Moments over the blob's bounding box only: boundingRect is a cheap scan,
+        # and the moment integrals then skip the empty rest of the ROI
+        blobX, blobY, blobWidth, blobHeight = cv2.boundingRect(mask)
+        moments = cv2.moments(mask[blobY:blobY + blobHeight, blobX:blobX + blobWidth], binaryImage=True)
+        if moments["m00"] == 0:
+            return None
+        
+        # Shift the (integer) first moments back to ROI coordinates before dividing,
+        # so the centroid rounds exactly as a moment over the whole mask would
+        centerX = (moments["m10"] + blobX * moments["m00"]) / moments["m00"]
+        centerY = (moments["m01"] + blobY * moments["m00"]) / moments["m00"]
+    else:
+        # Label 8-connected blobs; pixel areas and centroids come back in the same pass
+        labelCount, _, stats, centroids = cv2.connectedComponentsWithStats(mask, labels=labels, connectivity=8)
+        
+        # Label 0 is the background
+        if labelCount <= 1:
+            return None
+        
+        # Take the largest blob (most likely the crosshair); usually it is the only one
+        largest = 1
+        if labelCount > 2:
+            largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        centerX, centerY = centroids[largest]
+    
+    # Convert ROI coordinates back to full frame coordinates (undoing any downsampling)
+    roiCenterX = int(centerX * downsample)
+    roiCenterY = int(centerY * downsample)
     
     # Add ROI offset to get absolute position
     absoluteX = x1 + roiCenterX
@@ -63,7 +140,51 @@ def detectCrosshair(frame, crosshairColorLower, crosshairColorUpper, roiSize=200
     
     return (absoluteX, absoluteY)
 
-def trackCrosshairInVideo(videoPath, crosshairColorLower, crosshairColorUpper, sampleRate=1, roiSize=200):
+class CrosshairDetector:
+    """
+    Crosshair detector for a fixed ROI, reusing one mask buffer for every frame.
+    """
+    
+    def __init__(self, crosshairColorLower, crosshairColorUpper, roiBounds, singleBlob=False, downsample=1):
+        """
+        Args:
+            crosshairColorLower: Lower bound for crosshair color (BGR)
+            crosshairColorUpper: Upper bound for crosshair color (BGR)
+            roiBounds: (x1, y1, x2, y2) from getRoiBounds
+            singleBlob: See detectCrosshair
+            downsample: See detectCrosshair
+        """
+        # Converted once so OpenCV doesn't re-parse int64 arrays on every frame
+        self.crosshairColorLower = np.clip(crosshairColorLower, 0, 255).astype(np.uint8)
+        self.crosshairColorUpper = np.clip(crosshairColorUpper, 0, 255).astype(np.uint8)
+        self.x1, self.y1, self.x2, self.y2 = roiBounds
+        self.singleBlob = singleBlob
+        self.downsample = downsample
+        
+        roiHeight = self.y2 - self.y1
+        roiWidth = self.x2 - self.x1
+        if downsample > 1:
+            roiHeight = max(1, roiHeight // downsample)
+            roiWidth = max(1, roiWidth // downsample)
+        self.mask = np.empty((roiHeight, roiWidth), dtype=np.uint8)
+        self.labels = np.empty((roiHeight, roiWidth), dtype=np.int32)
+    
+    def detect(self, frame):
+        """
+        Detect the crosshair in a full frame.
+        
+        Args:
+            frame: BGR image from video
+        
+        Returns:
+            (x, y) tuple of crosshair center, or None if not found
+        """
+        roi = frame[self.y1:self.y2, self.x1:self.x2]
+        return detectCrosshairROI(roi, self.crosshairColorLower, self.crosshairColorUpper, self.x1, self.y1,
+                                  self.singleBlob, self.downsample, self.mask, self.labels)
+
+def trackCrosshairInVideo(videoPath, crosshairColorLower, crosshairColorUpper, sampleRate=1, roiSize=200,
+                          singleBlob=False, downsample=1):
     """
     Track crosshair throughout entire video.
     
@@ -73,9 +194,12 @@ def trackCrosshairInVideo(videoPath, crosshairColorLower, crosshairColorUpper, s
         crosshairColorUpper: Upper bound for crosshair color (BGR)
         sampleRate: Process every Nth frame (1 = every frame, 2 = every other frame)
         roiSize: Size of region of interest for crosshair detection
+        singleBlob: Use the mask-moment centroid (see detectCrosshair)
+        downsample: Search a 1/N-scale ROI (see detectCrosshair)
     
     Returns:
-        List of dictionaries: [{"frameNumber": int, "x": int, "y": int, "timestamp": float}, ...]
+        Structured array (POSITION_DTYPE) with one record per detected frame:
+        fields frameNumber, x, y, timestamp (index like the old position dicts)
     """
     cap = cv2.VideoCapture(videoPath)
     
@@ -83,83 +207,161 @@ def trackCrosshairInVideo(videoPath, crosshairColorLower, crosshairColorUpper, s
         raise ValueError(f"Could not open video: {videoPath}")
     
     fps = cap.get(cv2.CAP_PROP_FPS)
-    crosshairPositions = []
-    frameNumber = 0
+    
+    # Preallocate one record per sampled frame; grown if the container's
+    # frame count turns out to be short, trimmed to the detections at the end
+    frameCount = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    crosshairPositions = np.empty(max(1, frameCount // sampleRate + 1), dtype=POSITION_DTYPE)
+    trackedCount = 0
     
     print(f"Processing video at {fps} FPS...")
     
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Only process frames according to sample rate
-        if frameNumber % sampleRate == 0:
-            position = detectCrosshair(frame, crosshairColorLower, crosshairColorUpper, roiSize)
-            
-            if position:
-                timestamp = frameNumber / fps
-                crosshairPositions.append({
-                    "frameNumber": frameNumber,
-                    "x": position[0],
-                    "y": position[1],
-                    "timestamp": timestamp
-                })
-        
-        frameNumber += 1
-        
-        # Progress indicator
-        if frameNumber % 100 == 0:
-            print(f"Processed {frameNumber} frames...")
+    # Decoding runs on a reader thread; detection stays on this one.
+    # Frames skipped by sampleRate are only grabbed and arrive as None.
+    # ROI bounds (and the mask buffer) are fixed for the whole video;
+    # set up from the first decoded frame
+    detector = None
     
-    cap.release()
+    reader = FrameReader(cap, sampleRate)
+    try:
+        for frameNumber, frame in reader:
+            if frame is not None:
+                if detector is None:
+                    roiBounds = getRoiBounds(frame.shape[1], frame.shape[0], roiSize)
+                    detector = CrosshairDetector(crosshairColorLower, crosshairColorUpper, roiBounds,
+                                                 singleBlob, downsample)
+                
+                position = detector.detect(frame)
+                
+                if position:
+                    if trackedCount == len(crosshairPositions):
+                        crosshairPositions = np.concatenate((crosshairPositions, np.empty_like(crosshairPositions)))
+                    
+                    timestamp = frameNumber / fps
+                    crosshairPositions[trackedCount] = (frameNumber, position[0], position[1], timestamp)
+                    trackedCount += 1
+            
+            # Progress indicator
+            if (frameNumber + 1) % 100 == 0:
+                print(f"Processed {frameNumber + 1} frames...")
+    finally:
+        reader.close()
+        cap.release()
+    
+    crosshairPositions = crosshairPositions[:trackedCount].copy()
     print(f"Complete! Tracked {len(crosshairPositions)} frames with crosshair detected")
     
     return crosshairPositions
 
+def smoothPositionsArray(xs, ys, windowSize=5):
+    """
+    Moving-average smoothing of coordinate columns.
+    
+    Args:
+        xs: Array of x coordinates
+        ys: Array of y coordinates
+        windowSize: Number of frames to average over (clamped at the ends)
+    
+    Returns:
+        (smoothedXs, smoothedYs) int32 arrays, truncated toward zero
+    """
+    count = len(xs)
+    halfWindow = windowSize // 2
+    
+    # Clamped window [startIdx, endIdx) around each position
+    indices = np.arange(count)
+    startIdx = np.maximum(indices - halfWindow, 0)
+    endIdx = np.minimum(indices + halfWindow + 1, count)
+    windowLengths = endIdx - startIdx
+    
+    # Window sums by differencing a prefix sum (pixel values sum exactly in float64)
+    smoothed = []
+    for values in (xs, ys):
+        prefix = np.zeros(count + 1, dtype=np.float64)
+        np.cumsum(values, dtype=np.float64, out=prefix[1:])
+        windowMeans = (prefix[endIdx] - prefix[startIdx]) / windowLengths
+        smoothed.append(windowMeans.astype(np.int32))
+    
+    return smoothed[0], smoothed[1]
+
 def smoothPositions(positions, windowSize=5):
     """
     Smooth crosshair positions using moving average to reduce jitter.
     
     Args:
-        positions: List of position dictionaries from trackCrosshairInVideo
+        positions: Positions from trackCrosshairInVideo (structured array) or a
+                   list of position dictionaries
         windowSize: Number of frames to average over
     
     Returns:
-        Smoothed positions list
+        Smoothed positions, in the same form (array or list) as the input.
+        The list form is kept for older callers; new code should pass arrays
+        (or use smoothPositionsArray on the coordinate columns directly).
     """
     if len(positions) < windowSize:
         return positions
     
-    smoothed = []
+    if isinstance(positions, np.ndarray):
+        # Write the smoothed columns straight into the output records
+        smoothed = positions.copy()
+        smoothed["x"], smoothed["y"] = smoothPositionsArray(positions["x"], positions["y"], windowSize)
+        return smoothed
+    
+    count = len(positions)
+    xs = np.fromiter((p["x"] for p in positions), dtype=np.float64, count=count)
+    ys = np.fromiter((p["y"] for p in positions), dtype=np.float64, count=count)
+    smoothedXs, smoothedYs = smoothPositionsArray(xs, ys, windowSize)
+    
+    return [
+        {
+            "frameNumber": p["frameNumber"],
+            "x": avgX,
+            "y": avgY,
+            "timestamp": p["timestamp"]
+        }
+        for p, avgX, avgY in zip(positions, smoothedXs.tolist(), smoothedYs.tolist())
+    ]
+    
+def _trailBands(pointCount):
+    """
+    Group the segments of a trail into runs that share a line thickness.
     
-    for i in range(len(positions)):
-        # Get window of positions around current frame
-        startIdx = max(0, i - windowSize // 2)
-        endIdx = min(len(positions), i + windowSize // 2 + 1)
-        
-        window = positions[startIdx:endIdx]
-        
-        # Calculate average position
-        avgX = sum(p["x"] for p in window) / len(window)
-        avgY = sum(p["y"] for p in window) / len(window)
-        
-        smoothed.append({
-            "frameNumber": positions[i]["frameNumber"],
-            "x": int(avgX),
-            "y": int(avgY),
-            "timestamp": positions[i]["timestamp"]
-        })
+    Segment i (joining points i-1 and i) fades with alpha = i / pointCount:
+    thickness max(1, int(3 * alpha)) and a cyan level of int(255 * alpha).
+    Each band is drawn with the average cyan level of its segments.
+    
+    Args:
+        pointCount: Number of points currently in the trail
+    
+    Returns:
+        List of (firstPoint, lastPoint, color, thickness) tuples, oldest band first
+    """
+    if pointCount < 2:
+        return []
+    
+    segments = np.arange(1, pointCount)
+    alphas = segments / pointCount
+    thicknesses = np.maximum(1, (3 * alphas).astype(np.int64))
+    levels = (255 * alphas).astype(np.int64)
     
-    return smoothed
+    # Start of each run of equal thickness
+    bandStarts = np.flatnonzero(np.diff(thicknesses, prepend=0))
+    bandEnds = np.append(bandStarts[1:], len(segments))
     
+    bands = []
+    for start, end in zip(bandStarts.tolist(), bandEnds.tolist()):
+        level = int(levels[start:end].mean())
+        bands.append((int(segments[start]) - 1, int(segments[end - 1]), (0, level, level), int(thicknesses[start])))
+    
+    return bands
+
 def visualizeCrosshairPath(videoPath, crosshairPositions, outputPath):
     """
     Create a video with crosshair path visualized as a trail.
     
     Args:
         videoPath: Original video path
-        crosshairPositions: List of crosshair positions from trackCrosshairInVideo
+        crosshairPositions: Crosshair positions from trackCrosshairInVideo (array or list of dicts)
         outputPath: Where to save the visualization video
     """
     cap = cv2.VideoCapture(videoPath)
@@ -176,49 +378,66 @@ def visualizeCrosshairPath(videoPath, crosshairPositions, outputPath):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(outputPath, fourcc, fps, (width, height))
     
-    frameNumber = 0
-    positionIndex = 0
-    
-    # Store recent positions for trail effect
-    recentPositions = []
+    # Scatter the tracked points into a dense per-frame table once, so each
+    # frame is a direct lookup instead of a walk through the position list
+    if isinstance(crosshairPositions, np.ndarray):
+        positionFrames = crosshairPositions["frameNumber"].astype(np.int64)
+        positionXy = np.column_stack((crosshairPositions["x"], crosshairPositions["y"])).astype(np.int32)
+    else:
+        positionFrames = np.array([pos["frameNumber"] for pos in crosshairPositions], dtype=np.int64)
+        positionXy = np.array([(pos["x"], pos["y"]) for pos in crosshairPositions],
+                              dtype=np.float64).reshape(-1, 2).astype(np.int32)
+    
+    tableSize = int(positionFrames.max()) + 1 if positionFrames.size else 0
+    perFrameXy = np.zeros((tableSize, 2), dtype=np.int32)
+    perFrameTracked = np.zeros(tableSize, dtype=bool)
+    perFrameXy[positionFrames] = positionXy
+    perFrameTracked[positionFrames] = True
+    
+    # Recent positions for the trail effect, kept in a circular buffer
     trailLength = 30  # Show last 30 positions
+    trail = np.empty((trailLength, 2), dtype=np.int32)
+    trailHead = 0  # Next slot to overwrite (the oldest point once full)
+    trailCount = 0
     
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Find positions for this frame
-        while (positionIndex < len(crosshairPositions) and 
-               crosshairPositions[positionIndex]["frameNumber"] == frameNumber):
+    # Band layout for every possible trail length, computed once
+    trailBands = [_trailBands(pointCount) for pointCount in range(trailLength + 1)]
+    
+    # Decode and encode on background threads; drawing stays on this one
+    reader = FrameReader(cap)
+    writer = FrameWriter(out)
+    try:
+        for frameNumber, frame in reader:
+            if frame is None:
+                continue
             
-            pos = crosshairPositions[positionIndex]
-            recentPositions.append((pos["x"], pos["y"]))
+            # Add this frame's position, if one was tracked
+            if frameNumber < tableSize and perFrameTracked[frameNumber]:
+                trail[trailHead] = perFrameXy[frameNumber]
+                trailHead = (trailHead + 1) % trailLength
+                trailCount = min(trailCount + 1, trailLength)
             
-            # Keep only recent positions
-            if len(recentPositions) > trailLength:
-                recentPositions.pop(0)
+            # Oldest to newest
+            recentPositions = trail[(trailHead - trailCount + np.arange(trailCount)) % trailLength]
             
-            positionIndex += 1
-        
-        # Draw trail
-        for i in range(1, len(recentPositions)):
-            # Fade effect: older positions are more transparent
-            alpha = i / len(recentPositions)
-            color = (0, int(255 * alpha), int(255 * alpha))  # Cyan fade
-            thickness = max(1, int(3 * alpha))
+            # Draw trail: one polyline per thickness band
+            for firstPoint, lastPoint, color, thickness in trailBands[trailCount]:
+                cv2.polylines(frame, [recentPositions[firstPoint:lastPoint + 1]], False, color, thickness)
             
-            cv2.line(frame, recentPositions[i-1], recentPositions[i], color, thickness)
-        
-        # Draw current position
-        if recentPositions:
-            cv2.circle(frame, recentPositions[-1], 5, (0, 255, 255), -1)  # Cyan dot
-        
-        out.write(frame)
-        frameNumber += 1
+            # Draw current position
+            if trailCount:
+                cv2.circle(frame, tuple(recentPositions[-1].tolist()), 5, (0, 255, 255), -1)  # Cyan dot
+            
+            writer.write(frame)
+    finally:
+        reader.close()
+        try:
+            # Raises any encoding error not already reported by write()
+            writer.close()
+        finally:
+            cap.release()
+            out.release()
     
-    cap.release()
-    out.release()
     print(f"Visualization saved to {outputPath}")
 
 
@@ -256,7 +475,7 @@ if __name__ == "__main__":
         print(f"\n=== RESULTS ===")
         print(f"Total frames tracked: {len(positions)}")
         
-        if positions:
+        if len(positions):
             # Apply smoothing
             smoothedPositions = smoothPositions(positions, windowSize=5)
             
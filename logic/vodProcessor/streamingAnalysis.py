@@ -0,0 +1,180 @@
+import sys
+import os
+import threading
+from collections import deque
+
+# Add project root to Python path
+projectRoot = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, projectRoot)
+
+import cv2
+
+from logic.vodProcessor.crosshairTracker import CrosshairDetector, getRoiBounds
+
+class FrameBuffer:
+    """
+    Bounded hand-off between a video reader thread and a slower consumer.
+    
+    With dropOldest=True the reader never waits: once the buffer is full the
+    oldest frame is discarded, and the consumer always gets the newest frame
+    (skipping any stale backlog). With dropOldest=False it is a plain blocking
+    FIFO queue and every frame is processed.
+    """
+    
+    def __init__(self, maxFrames=4, dropOldest=True):
+        """
+        Args:
+            maxFrames: Maximum number of frames held at once
+            dropOldest: Drop stale frames instead of blocking the reader
+        """
+        self.maxFrames = maxFrames
+        self.dropOldest = dropOldest
+        self.droppedFrames = 0
+        self._frames = deque()
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    def put(self, item):
+        """
+        Add a frame (called by the reader thread).
+        """
+        with self._condition:
+            if self.dropOldest:
+                if len(self._frames) == self.maxFrames:
+                    self._frames.popleft()
+                    self.droppedFrames += 1
+            else:
+                while len(self._frames) == self.maxFrames and not self._closed:
+                    self._condition.wait()
+            
+            self._frames.append(item)
+            self._condition.notify_all()
+    
+    def get(self):
+        """
+        Wait for the next frame (called by the consumer).
+        
+        Returns:
+            The newest frame (dropOldest) or the oldest one (FIFO), or None once
+            the buffer is closed and empty
+        """
+        with self._condition:
+            while not self._frames and not self._closed:
+                self._condition.wait()
+            
+            if not self._frames:
+                return None
+            
+            if self.dropOldest:
+                item = self._frames.pop()
+                self.droppedFrames += len(self._frames)
+                self._frames.clear()
+            else:
+                item = self._frames.popleft()
+            
+            self._condition.notify_all()
+            return item
+    
+    def close(self):
+        """
+        Mark the end of the stream; get() returns None once drained.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def _readIntoBuffer(cap, frameBuffer, stopEvent):
+    """
+    Reader thread: decode frames at full rate into the buffer.
+    """
+    try:
+        frameNumber = 0
+        while not stopEvent.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            frameBuffer.put((frameNumber, frame))
+            frameNumber += 1
+    finally:
+        frameBuffer.close()
+
+
+def analyzeVideoStreaming(videoPath, targetDetector, crosshairColorLower, crosshairColorUpper, roiSize=200,
+                          bufferSize=4, dropOldest=True, confidenceThreshold=0.5):
+    """
+    Track the crosshair and detect targets with the reader decoupled from inference.
+    
+    Decoding runs at full rate on a background thread while this thread runs
+    crosshair detection and YOLO at its own pace. With dropOldest the analysis
+    always works on the most recent frame and skips frames it can't keep up
+    with, so throughput is bounded by the slower stage rather than the sum.
+    
+    Args:
+        videoPath: Path to video file
+        targetDetector: TargetDetector instance
+        crosshairColorLower: Lower bound for crosshair color (BGR)
+        crosshairColorUpper: Upper bound for crosshair color (BGR)
+        roiSize: Size of region of interest for crosshair detection
+        bufferSize: Maximum number of decoded frames waiting for analysis
+        dropOldest: Skip stale frames instead of analyzing every frame
+        confidenceThreshold: Minimum confidence for target detections
+    
+    Returns:
+        List of per-frame dictionaries: frameNumber, timestamp, crosshair ((x, y) or None),
+        targets (detectHeads output) and nearestTarget (findNearestTarget output or None)
+    """
+    cap = cv2.VideoCapture(videoPath)
+    
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {videoPath}")
+    
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    
+    frameBuffer = FrameBuffer(bufferSize, dropOldest)
+    stopEvent = threading.Event()
+    reader = threading.Thread(target=_readIntoBuffer, args=(cap, frameBuffer, stopEvent), daemon=True)
+    reader.start()
+    
+    print(f"Streaming analysis at {fps} FPS...")
+    
+    detector = None
+    results = []
+    try:
+        while True:
+            item = frameBuffer.get()
+            if item is None:
+                break
+            
+            frameNumber, frame = item
+            
+            if detector is None:
+                roiBounds = getRoiBounds(frame.shape[1], frame.shape[0], roiSize)
+                detector = CrosshairDetector(crosshairColorLower, crosshairColorUpper, roiBounds)
+            
+            crosshair = detector.detect(frame)
+            targets = targetDetector.detectHeads(frame, confidenceThreshold)
+            nearestTarget = targetDetector.findNearestTarget(crosshair, targets) if crosshair else None
+            
+            results.append({
+                "frameNumber": frameNumber,
+                "timestamp": frameNumber / fps,
+                "crosshair": crosshair,
+                "targets": targets,
+                "nearestTarget": nearestTarget
+            })
+            
+            # Progress indicator
+            if len(results) % 100 == 0:
+                print(f"Analyzed {len(results)} frames (up to frame {frameNumber})...")
+    finally:
+        # Stop the reader and unblock it if it is waiting on a full FIFO buffer
+        stopEvent.set()
+        frameBuffer.close()
+        reader.join()
+        cap.release()
+    
+    print(f"Complete! Analyzed {len(results)} frames, dropped {frameBuffer.droppedFrames}")
+    
+    return results
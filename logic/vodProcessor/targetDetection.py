@@ -1,5 +1,6 @@
 import cv2
 import numpy as np
+import torch
 from ultralytics import YOLO
 
 class TargetDetector:
@@ -7,7 +8,7 @@ class TargetDetector:
     Detect player/bot heads in Valorant footage using YOLO.
     """
     
-    def __init__(self, modelPath='yolov8n.pt'):
+    def __init__(self, modelPath='yolov8n.pt', device=None, half=None):
         """
         Initialize YOLO model.
         
@@ -16,9 +17,19 @@ class TargetDetector:
                       'yolov8n.pt' = nano (fastest)
                       'yolov8s.pt' = small
                       'yolov8m.pt' = medium (more accurate)
+            device: Inference device ('cpu', 0, 'cuda:0', ...); defaults to the
+                    first GPU when CUDA is available, otherwise the CPU
+            half: Run inference in fp16; defaults to True on GPU (fp16 is not
+                  supported on CPU)
         """
         self.model = YOLO(modelPath)
         
+        if device is None:
+            device = 0 if torch.cuda.is_available() else 'cpu'
+        if half is None:
+            half = device != 'cpu'
+        self.inferenceArgs = {'device': device, 'half': half}
+        
     def detectHeads(self, frame, confidenceThreshold=0.5):
         """
         Detect heads/people in a frame.
@@ -31,42 +42,77 @@ class TargetDetector:
             List of (x, y, width, height, confidence) for each detected head
         """
         # Run YOLO inference
-        results = self.model(frame, verbose=False)
+        results = self.model(frame, verbose=False, **self.inferenceArgs)
         
         detections = []
         
         for result in results:
-            boxes = result.boxes
-            
-            for box in boxes:
-                # Get class (0 = person in COCO dataset)
-                cls = int(box.cls[0])
-                conf = float(box.conf[0])
-                
-                # Filter for 'person' class with sufficient confidence
-                if cls == 0 and conf >= confidenceThreshold:
-                    # Get bounding box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    
-                    # Calculate center and dimensions
-                    centerX = int((x1 + x2) / 2)
-                    centerY = int((y1 + y2) / 2)
-                    width = int(x2 - x1)
-                    height = int(y2 - y1)
-                    
-                    # Estimate head position (top 20% of person bounding box)
-                    headY = int(y1 + height * 0.15)
-                    
-                    detections.append({
-                        'x': centerX,
-                        'y': headY,
-                        'width': width,
-                        'height': height,
-                        'confidence': conf
-                    })
+            detections.extend(self._parseHeads(result, confidenceThreshold))
         
         return detections
     
+    def detectHeadsBatch(self, frames, confidenceThreshold=0.5):
+        """
+        Detect heads/people in several frames with a single YOLO call.
+        Batching amortizes the model's per-call pre/post-processing and
+        GPU launch overhead across frames.
+        
+        Args:
+            frames: List of BGR images from video
+            confidenceThreshold: Minimum confidence for detection
+        
+        Returns:
+            List with one detection list (same format as detectHeads) per frame
+        """
+        if not frames:
+            return []
+        
+        results = self.model(frames, verbose=False, **self.inferenceArgs)
+        
+        return [self._parseHeads(result, confidenceThreshold) for result in results]
+    
+    def _parseHeads(self, result, confidenceThreshold):
+        """
+        Convert one YOLO result into head detection dictionaries.
+        
+        Args:
+            result: Single ultralytics Results object
+            confidenceThreshold: Minimum confidence for detection
+        
+        Returns:
+            List of detection dictionaries
+        """
+        boxes = result.boxes
+        
+        # One device->host transfer per field instead of one per box
+        cls = boxes.cls.cpu().numpy()
+        conf = boxes.conf.cpu().numpy()
+        xyxy = boxes.xyxy.cpu().numpy()
+        
+        # Filter for 'person' class (0 in COCO dataset) with sufficient confidence
+        keep = (cls.astype(np.int64) == 0) & (conf.astype(np.float64) >= confidenceThreshold)
+        x1, y1, x2, y2 = xyxy[keep].T
+        
+        # Calculate center and dimensions (truncated like int())
+        centerX = ((x1 + x2) / 2).astype(np.int64)
+        width = (x2 - x1).astype(np.int64)
+        height = (y2 - y1).astype(np.int64)
+        
+        # Estimate head position (top 20% of person bounding box)
+        headY = (y1 + (height * 0.15).astype(y1.dtype)).astype(np.int64)
+        
+        return [
+            {
+                'x': x,
+                'y': y,
+                'width': w,
+                'height': h,
+                'confidence': c
+            }
+            for x, y, w, h, c in zip(centerX.tolist(), headY.tolist(), width.tolist(),
+                                     height.tolist(), conf[keep].tolist())
+        ]
+    
     def findNearestTarget(self, crosshairPos, targets, maxDistance=300):
         """
         Find the nearest target to crosshair position.
@@ -82,18 +128,18 @@ class TargetDetector:
         if not targets:
             return None
         
-        nearestTarget = None
-        nearestDistance = float('inf')
-        
-        for target in targets:
-            distance = np.sqrt(
-                (crosshairPos[0] - target['x'])**2 + 
-                (crosshairPos[1] - target['y'])**2
-            )
-            
-            if distance < nearestDistance and distance < maxDistance:
-                nearestDistance = distance
-                nearestTarget = target.copy()
-                nearestTarget['distance'] = distance
+        # Distances to all targets at once; out-of-range ones can never win
+        targetPoints = np.array([(target['x'], target['y']) for target in targets], dtype=np.float64)
+        offsets = targetPoints - np.asarray(crosshairPos, dtype=np.float64)
+        distances = np.sqrt((offsets ** 2).sum(axis=1))
+        distances[distances >= maxDistance] = np.inf
+        
+        # argmin returns the first of equally near targets
+        nearestIndex = int(np.argmin(distances))
+        if not np.isfinite(distances[nearestIndex]):
+            return None
+        
+        nearestTarget = targets[nearestIndex].copy()
+        nearestTarget['distance'] = distances[nearestIndex]
         
         return nearestTarget
\ No newline at end of file
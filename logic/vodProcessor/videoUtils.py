@@ -1,16 +1,88 @@
 import json
 import os
+import queue
+import threading
+import numpy as np
+
+# orjson is optional: much faster (de)serialization of large tracking files,
+# with the stdlib json module as the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Structured (one record per tracked frame) layout for crosshair positions.
+# Field names match the position dictionary keys, so records and dicts index the same way.
+# Pixel coordinates fit float32 exactly; timestamps stay float64 so per-frame
+# deltas keep their precision late into long VODs.
+POSITION_DTYPE = np.dtype([
+    ("frameNumber", np.int32),
+    ("x", np.float32),
+    ("y", np.float32),
+    ("timestamp", np.float64)
+])
+
+def recordsToDicts(records):
+    """
+    Convert a structured/record array into a list of dictionaries.
+    
+    Args:
+        records: NumPy structured array (e.g. positions or detectFlicks output)
+    
+    Returns:
+        List of dictionaries keyed by field name with plain Python values
+    """
+    names = records.dtype.names
+    return [dict(zip(names, row)) for row in records.tolist()]
+
+
+def _numpyToJson(value):
+    """
+    json.dump fallback for NumPy scalars and arrays (orjson handles these natively).
+    """
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def saveJson(data, outputPath):
+    """
+    Write data to an indented JSON file (orjson when available).
+    
+    Args:
+        data: JSON-serializable data; NumPy scalars and arrays are allowed
+        outputPath: Path to save JSON file
+    """
+    if orjson is not None:
+        with open(outputPath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(outputPath, 'w') as f:
+            json.dump(data, f, indent=2, default=_numpyToJson)
+
 
 def saveTrackingData(positions, outputPath):
     """
     Save tracking data to JSON file.
     
     Args:
-        positions: List of position dictionaries from trackCrosshairInVideo
+        positions: Positions from trackCrosshairInVideo (structured array) or a
+                   list of position dictionaries
         outputPath: Path to save JSON file
     """
-    with open(outputPath, 'w') as f:
-        json.dump(positions, f, indent=2)
+    if isinstance(positions, np.ndarray):
+        # x/y are stored as float32, but the tracker only produces whole pixels:
+        # write them as ints so the file matches the list-of-dicts output
+        positions = [
+            {"frameNumber": frameNumber, "x": x, "y": y, "timestamp": timestamp}
+            for frameNumber, x, y, timestamp in zip(
+                positions["frameNumber"].tolist(),
+                positions["x"].astype(np.int64).tolist(),
+                positions["y"].astype(np.int64).tolist(),
+                positions["timestamp"].tolist())
+        ]
+    
+    saveJson(positions, outputPath)
     
     print(f"Saved tracking data to {outputPath}")
 
@@ -28,13 +100,62 @@ def loadTrackingData(jsonPath):
     if not os.path.exists(jsonPath):
         raise FileNotFoundError(f"Tracking data not found: {jsonPath}")
     
-    with open(jsonPath, 'r') as f:
-        positions = json.load(f)
+    if orjson is not None:
+        with open(jsonPath, 'rb') as f:
+            positions = orjson.loads(f.read())
+    else:
+        with open(jsonPath, 'r') as f:
+            positions = json.load(f)
     
     print(f"Loaded {len(positions)} positions from {jsonPath}")
     return positions
 
 
+def loadTrackingArray(jsonPath):
+    """
+    Load tracking data as a POSITION_DTYPE structured array, with a binary cache.
+    
+    Side effect: the first load parses the JSON and writes the records to a
+    .npy file next to it (tracking_x.json -> tracking_x.npy). Later loads
+    memory-map that file instead of re-parsing. The cache is stamped with the
+    JSON's modification time and only used while the two match exactly, so a
+    re-exported or replaced JSON (even an older copy) is parsed again. If the
+    cache can't be written (e.g. read-only folder) the parsed data is still
+    returned.
+    
+    Args:
+        jsonPath: Path to JSON file
+    
+    Returns:
+        Structured array of positions (read-only memory map when cached)
+    """
+    if not os.path.exists(jsonPath):
+        raise FileNotFoundError(f"Tracking data not found: {jsonPath}")
+    
+    cachePath = os.path.splitext(jsonPath)[0] + ".npy"
+    jsonStat = os.stat(jsonPath)
+    if os.path.exists(cachePath) and os.stat(cachePath).st_mtime_ns == jsonStat.st_mtime_ns:
+        positions = np.load(cachePath, mmap_mode='r')
+        print(f"Loaded {len(positions)} positions from {cachePath}")
+        return positions
+    
+    positionDicts = loadTrackingData(jsonPath)
+    positions = np.fromiter(
+        ((p["frameNumber"], p["x"], p["y"], p["timestamp"]) for p in positionDicts),
+        dtype=POSITION_DTYPE,
+        count=len(positionDicts)
+    )
+    
+    try:
+        np.save(cachePath, positions)
+        # Stamp only after a complete write, so a partial file is never trusted
+        os.utime(cachePath, ns=(jsonStat.st_atime_ns, jsonStat.st_mtime_ns))
+    except OSError as e:
+        print(f"Could not cache tracking data to {cachePath}: {e}")
+    
+    return positions
+
+
 def getVideoMetadata(videoPath):
     """
     Extract basic metadata from video file.
@@ -66,4 +187,132 @@ def getVideoMetadata(videoPath):
         "height": height,
         "frameCount": frameCount,
         "duration": duration
-    }
\ No newline at end of file
+    }
+
+
+# Frames buffered between the decode/encode threads and the main thread.
+# Bounded so a slow consumer applies back-pressure instead of buffering the VOD.
+FRAME_QUEUE_SIZE = 8
+
+
+class FrameReader:
+    """
+    Decode frames from an open cv2.VideoCapture on a background thread.
+    
+    Iterating yields (frameNumber, frame) for every frame in the stream; frames
+    not selected by sampleRate are only grabbed (never decoded) and come
+    through as None. Decoding releases the GIL, so it overlaps with whatever
+    the main thread does with the previous frames.
+    """
+    
+    def __init__(self, cap, sampleRate=1, queueSize=FRAME_QUEUE_SIZE):
+        """
+        Args:
+            cap: Opened cv2.VideoCapture (still owned and released by the caller)
+            sampleRate: Decode every Nth frame (1 = every frame)
+            queueSize: Maximum number of frames buffered ahead of the consumer
+        """
+        self.cap = cap
+        self.sampleRate = sampleRate
+        self.frames = queue.Queue(maxsize=queueSize)
+        self._stopEvent = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._readFrames, daemon=True)
+        self._thread.start()
+    
+    def _readFrames(self):
+        try:
+            frameNumber = 0
+            while not self._stopEvent.is_set():
+                if not self.cap.grab():
+                    break
+                
+                frame = None
+                if frameNumber % self.sampleRate == 0:
+                    ret, frame = self.cap.retrieve()
+                    if not ret:
+                        frame = None
+                
+                self.frames.put((frameNumber, frame))
+                frameNumber += 1
+        finally:
+            # Sentinel: end of stream (or reader stopped/failed)
+            self.frames.put(None)
+    
+    def __iter__(self):
+        while not self._finished:
+            item = self.frames.get()
+            if item is None:
+                self._finished = True
+                return
+            yield item
+    
+    def close(self):
+        """
+        Stop the reader thread. Must be called before releasing the capture.
+        """
+        self._stopEvent.set()
+        # Drain so a reader blocked on a full queue can reach the sentinel
+        while not self._finished:
+            if self.frames.get() is None:
+                self._finished = True
+        self._thread.join()
+
+
+class FrameWriter:
+    """
+    Encode frames to an open cv2.VideoWriter on a background thread.
+    
+    If encoding fails, the exception is raised from the next write() call,
+    or from close() if no write() reported it.
+    """
+    
+    def __init__(self, out, queueSize=FRAME_QUEUE_SIZE):
+        """
+        Args:
+            out: Opened cv2.VideoWriter (still owned and released by the caller)
+            queueSize: Maximum number of frames waiting to be encoded
+        """
+        self.out = out
+        self.frames = queue.Queue(maxsize=queueSize)
+        self._error = None
+        self._errorReported = False
+        self._thread = threading.Thread(target=self._writeFrames, daemon=True)
+        self._thread.start()
+    
+    def _writeFrames(self):
+        # Keep draining until the sentinel even after a failed write, so
+        # write() and close() never block on a full queue nobody reads
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            if self._error is None:
+                try:
+                    self.out.write(frame)
+                except Exception as e:
+                    self._error = e
+    
+    def _raiseError(self):
+        """
+        Re-raise a stored encoding error on the caller's thread (once).
+        """
+        if self._error is not None and not self._errorReported:
+            self._errorReported = True
+            raise self._error
+    
+    def write(self, frame):
+        """
+        Queue a frame for encoding. The frame must not be modified afterwards.
+        """
+        self._raiseError()
+        self.frames.put(frame)
+    
+    def close(self):
+        """
+        Flush queued frames and stop the writer thread. Must be called before
+        releasing the writer.
+        """
+        self.frames.put(None)
+        self._thread.join()
+        self._raiseError()
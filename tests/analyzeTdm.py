@@ -1,5 +1,8 @@
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
 import numpy as np
 
 projectRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -37,7 +40,7 @@ def analyzeTdmGameplay(videoPath, sensitivity):
         roiSize=800
     )
     
-    if not positions:
+    if not len(positions):
         print("❌ Could not track crosshair")
         return None
     
@@ -50,37 +53,22 @@ def analyzeTdmGameplay(videoPath, sensitivity):
     
     # Get movement analysis
     movements = metrics.movements
-    velocities = [m["velocity"] for m in movements]
+    velocities = movements["velocity"]
+    distances = movements["distance"]
     
     # Detect flicks (high velocity movements)
-    flicks = [m for m in movements if m["velocity"] > 2000]
+    flickDistances = distances[velocities > 2000]
     
     # Detect micro-adjustments (small, slower movements)
-    microAdjustments = [m for m in movements if 10 < m["distance"] < 50 and m["velocity"] < 1000]
-    
-    # Detect corrections (direction reversals after fast movements)
-    corrections = []
-    for i in range(1, len(movements)):
-        prev = movements[i-1]
-        curr = movements[i]
-        
-        # Check if direction reversed after a fast movement
-        if prev["velocity"] > 1500:
-            prevAngle = np.arctan2(prev["dy"], prev["dx"])
-            currAngle = np.arctan2(curr["dy"], curr["dx"])
-            angleDiff = abs(prevAngle - currAngle)
-            
-            if angleDiff > np.pi / 2:  # >90 degree change = correction
-                corrections.append({
-                    "frame": curr["frameStart"],
-                    "correctionDistance": curr["distance"]
-                })
+    microAdjustments = metrics.detectMicroAdjustments()
+    
+    # Detect corrections (>90 degree direction reversals after fast movements)
+    correctionDistances = distances[metrics.detectCorrections(velocityThreshold=1500)]
     
     # Analyze flick distances
-    flickDistances = [f["distance"] for f in flicks]
-    smallFlicks = [f for f in flicks if f["distance"] < 100]
-    mediumFlicks = [f for f in flicks if 100 <= f["distance"] < 300]
-    largeFlicks = [f for f in flicks if f["distance"] >= 300]
+    smallFlicks = flickDistances[flickDistances < 100]
+    mediumFlicks = flickDistances[(flickDistances >= 100) & (flickDistances < 300)]
+    largeFlicks = flickDistances[flickDistances >= 300]
     
     # Calculate diagnostics
     diagnostics = {
@@ -89,14 +77,14 @@ def analyzeTdmGameplay(videoPath, sensitivity):
         "avgVelocity": metrics.getAverageVelocity(),
         "maxVelocity": metrics.getMaxVelocity(),
         "smoothness": metrics.getSmoothness(),
-        "flickCount": len(flicks),
+        "flickCount": len(flickDistances),
         "smallFlickCount": len(smallFlicks),
         "mediumFlickCount": len(mediumFlicks),
         "largeFlickCount": len(largeFlicks),
-        "avgFlickDistance": np.mean(flickDistances) if flickDistances else 0,
+        "avgFlickDistance": np.mean(flickDistances) if flickDistances.size else 0,
         "microAdjustmentCount": len(microAdjustments),
-        "correctionCount": len(corrections),
-        "avgCorrectionDistance": np.mean([c["correctionDistance"] for c in corrections]) if corrections else 0,
+        "correctionCount": len(correctionDistances),
+        "avgCorrectionDistance": np.mean(correctionDistances) if correctionDistances.size else 0,
         "velocityMedian": np.median(velocities),
         "velocity95th": np.percentile(velocities, 95)
     }
@@ -243,6 +231,41 @@ def provideDiagnostics(diagnostics, sensitivity):
     print(f"{'='*70}\n")
 
 
+def _initWorker():
+    """
+    Process pool initializer: each worker analyzes a whole video on its own,
+    so keep OpenCV single-threaded to avoid oversubscribing the cores.
+    
+    Workers also discard their stdout: the analysis banners and tracker
+    progress lines would interleave across videos, so only the reports
+    printed in order by the main process are shown.
+    """
+    cv2.setNumThreads(1)
+    sys.stdout = open(os.devnull, 'w')
+
+
+def _analyzeTest(test):
+    """
+    Process pool entry point for one test video.
+    
+    Args:
+        test: Dictionary with video and sens keys
+    
+    Returns:
+        (diagnostics, error) tuple; diagnostics is None and error says why
+        when the video could not be analyzed
+    """
+    try:
+        diagnostics = analyzeTdmGameplay(test["video"], test["sens"])
+    except Exception as e:
+        return None, f"❌ Error: {e}"
+    
+    if diagnostics is None:
+        return None, "❌ Could not track crosshair"
+    
+    return diagnostics, None
+
+
 # Main execution
 if __name__ == "__main__":
     # Test videos
@@ -252,12 +275,24 @@ if __name__ == "__main__":
         # Add more as you record them
     ]
     
+    availableTests = []
     for test in tests:
         if not os.path.exists(test["video"]):
             print(f"⚠️  Video not found: {test['video']}")
             continue
-        
-        diagnostics = analyzeTdmGameplay(test["video"], test["sens"])
-        
-        if diagnostics:
-            provideDiagnostics(diagnostics, test["sens"])
\ No newline at end of file
+        availableTests.append(test)
+    
+    # Videos are independent, so analyze them in parallel and report in order
+    if availableTests:
+        workerCount = min(len(availableTests), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workerCount, initializer=_initWorker) as executor:
+            results = executor.map(_analyzeTest, availableTests)
+            for test, (diagnostics, error) in zip(availableTests, results):
+                print(f"\n{'='*70}")
+                print(f"Video: {test['video']}")
+                
+                if error:
+                    print(error)
+                    continue
+                
+                provideDiagnostics(diagnostics, test["sens"])
\ No newline at end of file
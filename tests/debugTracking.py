@@ -1,6 +1,15 @@
+import sys
+import os
 import cv2
 import numpy as np
 
+# Add project root to Python path
+projectRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, projectRoot)
+
+from logic.vodProcessor.crosshairTracker import getRoiBounds
+from logic.vodProcessor.videoUtils import FrameReader
+
 videos = [
     ("11.mp4", 0.11),
     ("145.mp4", 0.145),
@@ -8,9 +17,19 @@ videos = [
     ("43.mp4", 0.43)
 ]
 
-# Green crosshair bounds
-lowerBound = np.array([0, 200, 0])
-upperBound = np.array([100, 255, 100])
+# Frames scanned per video
+maxFrames = 2000
+
+# Scan every Nth frame; skipped frames are only grabbed, never decoded.
+# Frame numbers are kept, so movement velocities still use the real time gap
+sampleRate = 1
+
+# Search window centered on the screen (same as processAllVods.py)
+roiSize = 800
+
+# Green crosshair bounds (uint8 to match the frames, built once)
+lowerBound = np.array([0, 200, 0], dtype=np.uint8)
+upperBound = np.array([100, 255, 100], dtype=np.uint8)
 
 for videoPath, sens in videos:
     print(f"\n{'='*60}")
@@ -21,48 +40,55 @@ for videoPath, sens in videos:
     fps = cap.get(cv2.CAP_PROP_FPS)
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    x1, y1, x2, y2 = getRoiBounds(width, height, roiSize)
     
-    frameNumber = 0
-    positions = []
+    scannedFrames = 0
+    positions = np.empty((maxFrames, 3), dtype=np.int64)  # (frameNumber, x, y) rows
+    trackedCount = 0
+    mask = None  # Reused ROI mask buffer, allocated from the first frame
     
-    while frameNumber < 2000:  # Check first 2000 frames
-        ret, frame = cap.read()
-        if not ret:
+    # Decode on a background thread so it overlaps with the scan below
+    reader = FrameReader(cap, sampleRate=sampleRate)
+    for frameNumber, frame in reader:
+        if frameNumber >= maxFrames:  # Check first 2000 frames
             break
         
-        # Search ENTIRE frame
-        mask = cv2.inRange(frame, lowerBound, upperBound)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if frame is None:  # Skipped by sampleRate
+            continue
+        
+        # Search the center ROI only (the crosshair never leaves screen center)
+        roi = frame[y1:y2, x1:x2]
+        if mask is None:
+            mask = np.empty(roi.shape[:2], dtype=np.uint8)
+        cv2.inRange(roi, lowerBound, upperBound, dst=mask)
+        labelCount, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8, ltype=cv2.CV_32S)
         
-        if contours:
-            largest = max(contours, key=cv2.contourArea)
-            M = cv2.moments(largest)
-            if M["m00"] > 0:
-                x = int(M["m10"] / M["m00"])
-                y = int(M["m01"] / M["m00"])
-                positions.append((frameNumber, x, y))
+        # Label 0 is the background; take the largest blob, as the tracker does
+        if labelCount > 1:
+            largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+            x, y = centroids[largest]
+            positions[trackedCount] = (frameNumber, int(x) + x1, int(y) + y1)
+            trackedCount += 1
         
-        frameNumber += 1
+        scannedFrames += 1
     
+    reader.close()
     cap.release()
+    positions = positions[:trackedCount]
     
-    print(f"Tracked {len(positions)} / {frameNumber} frames ({len(positions)/frameNumber*100:.1f}%)")
+    print(f"Tracked {len(positions)} / {scannedFrames} frames ({len(positions)/scannedFrames*100:.1f}%)")
     
     if len(positions) > 1:
         maxMove = 0
         maxMoveFrames = (0, 0)
         
-        for i in range(1, len(positions)):
-            prev = positions[i-1]
-            curr = positions[i]
-            
-            dx = curr[1] - prev[1]
-            dy = curr[2] - prev[2]
-            distance = np.sqrt(dx**2 + dy**2)
-            
-            if distance > maxMove:
-                maxMove = distance
-                maxMoveFrames = (prev[0], curr[0])
+        # All step distances at once, first largest wins
+        distances = np.hypot(np.diff(positions[:, 1]), np.diff(positions[:, 2]))
+        i = int(distances.argmax())
+        
+        if distances[i] > maxMove:
+            maxMove = float(distances[i])
+            maxMoveFrames = (int(positions[i, 0]), int(positions[i + 1, 0]))
         
         timeDiff = (maxMoveFrames[1] - maxMoveFrames[0]) / fps
         velocity = maxMove / timeDiff if timeDiff > 0 else 0
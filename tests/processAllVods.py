@@ -1,5 +1,8 @@
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
 import numpy as np
 
 # Add project root to Python path
@@ -11,12 +14,10 @@ from logic.vodProcessor.videoUtils import saveTrackingData, getVideoMetadata
 
 # Create exports folder if it doesn't exist
 exportsFolder = "exports"
-if not os.path.exists(exportsFolder):
-    os.makedirs(exportsFolder)
 
-# Crosshair color bounds - GREEN
-lowerBound = np.array([0, 150, 0])
-upperBound = np.array([150, 255, 150])
+# Crosshair color bounds - GREEN (tuples so they pickle cheaply to workers)
+lowerBound = (0, 150, 0)
+upperBound = (150, 255, 150)
 
 # VODs to process with their sensitivities and weapons
 vods = [
@@ -31,57 +32,92 @@ vods = [
 sampleRate = 1
 roiSize = 800
 
-print("=== PROCESSING ALL VODs ===\n")
+# Re-decoding and re-encoding every VOD for the path overlay costs more than
+# tracking it, so only render visualizations when asked (--visualize)
+visualize = "--visualize" in sys.argv
+
+def _initWorker():
+    """
+    Process pool initializer: each worker processes a whole VOD on its own,
+    so keep OpenCV single-threaded to avoid oversubscribing the cores.
+    
+    Workers also discard their stdout: the tracker's progress lines would
+    interleave across VODs, so the status string processVod returns is the
+    only output (printed in order by the main process).
+    """
+    cv2.setNumThreads(1)
+    sys.stdout = open(os.devnull, 'w')
 
-for vod in vods:
+
+def processVod(vod, visualize=False):
+    """
+    Track, smooth, export and (optionally) visualize a single VOD.
+    
+    Args:
+        vod: Dictionary with file, sens and weapon keys
+        visualize: Also render the crosshair path overlay video
+    
+    Returns:
+        Status string summarizing the result
+    """
     videoPath = vod["file"]
     sensitivity = vod["sens"]
     weapon = vod["weapon"]
     
-    print(f"\n{'='*60}")
-    print(f"Processing: {videoPath}")
-    print(f"Sensitivity: {sensitivity} | Weapon: {weapon}")
-    print(f"{'='*60}")
+    header = f"Processing: {videoPath}\nSensitivity: {sensitivity} | Weapon: {weapon}"
     
     try:
         # Get video metadata
         metadata = getVideoMetadata(videoPath)
-        print(f"Resolution: {metadata['width']}x{metadata['height']}")
-        print(f"FPS: {metadata['fps']}")
-        print(f"Duration: {metadata['duration']:.2f} seconds\n")
+        header += f"\nResolution: {metadata['width']}x{metadata['height']} | FPS: {metadata['fps']} | Duration: {metadata['duration']:.2f} seconds"
         
         # Track crosshair
         positions = trackCrosshairInVideo(
             videoPath,
-            lowerBound,
-            upperBound,
+            np.array(lowerBound, dtype=np.uint8),
+            np.array(upperBound, dtype=np.uint8),
             sampleRate=sampleRate,
             roiSize=roiSize
         )
         
-        if positions:
-            # Apply smoothing
-            smoothedPositions = smoothPositions(positions, windowSize=5)
-            
-            print(f"Tracked {len(smoothedPositions)} frames")
-            
-            # Save tracking data to exports folder with weapon info
-            outputJson = os.path.join(exportsFolder, f"tracking_{sensitivity}_{weapon}.json")
-            saveTrackingData(smoothedPositions, outputJson)
-            
-            # Create visualization in exports folder
-            outputVideo = os.path.join(exportsFolder, f"visualized_{sensitivity}_{weapon}.mp4")
-            visualizeCrosshairPath(videoPath, smoothedPositions, outputVideo)
-            
-            print(f"✓ Saved to {outputJson} and {outputVideo}")
-        else:
-            print(f"✗ No crosshair positions detected!")
+        if not len(positions):
+            return f"{header}\n✗ No crosshair positions detected!"
+        
+        # Apply smoothing
+        smoothedPositions = smoothPositions(positions, windowSize=5)
+        
+        # Save tracking data to exports folder with weapon info
+        outputJson = os.path.join(exportsFolder, f"tracking_{sensitivity}_{weapon}.json")
+        saveTrackingData(smoothedPositions, outputJson)
+        
+        if not visualize:
+            return f"{header}\nTracked {len(smoothedPositions)} frames\n✓ Saved to {outputJson}"
+        
+        # Create visualization in exports folder
+        outputVideo = os.path.join(exportsFolder, f"visualized_{sensitivity}_{weapon}.mp4")
+        visualizeCrosshairPath(videoPath, smoothedPositions, outputVideo)
+        
+        return f"{header}\nTracked {len(smoothedPositions)} frames\n✓ Saved to {outputJson} and {outputVideo}"
     
     except FileNotFoundError:
-        print(f"✗ Error: Could not find {videoPath}")
+        return f"{header}\n✗ Error: Could not find {videoPath}"
     except Exception as e:
-        print(f"✗ Error: {e}")
+        return f"{header}\n✗ Error: {e}"
 
-print(f"\n{'='*60}")
-print("All VODs processed!")
-print(f"{'='*60}")
\ No newline at end of file
+
+if __name__ == "__main__":
+    os.makedirs(exportsFolder, exist_ok=True)
+    
+    print("=== PROCESSING ALL VODs ===\n")
+    
+    # VODs are independent, so process them in parallel and report in order
+    workerCount = min(len(vods), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workerCount, initializer=_initWorker) as executor:
+        for status in executor.map(processVod, vods, [visualize] * len(vods)):
+            print(f"\n{'='*60}")
+            print(status)
+            print(f"{'='*60}")
+    
+    print(f"\n{'='*60}")
+    print("All VODs processed!")
+    print(f"{'='*60}")
@@ -6,12 +6,11 @@ import numpy as np
 projectRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, projectRoot)
 
-from logic.vodProcessor.videoUtils import loadTrackingData
+from logic.vodProcessor.videoUtils import loadTrackingArray, saveJson
 from logic.analysis.metrics import CrosshairMetrics
-import json
 
 # Load tracking data
-trackingData = loadTrackingData("tracking_data.json")
+trackingData = loadTrackingArray("tracking_data.json")
 
 # Calculate metrics
 metrics = CrosshairMetrics(trackingData)
@@ -39,23 +38,27 @@ print(f"Total tracking distance: {summary['totalTrackingDistance']:.2f} pixels")
 
 # NEW: Velocity distribution analysis
 print("\n=== VELOCITY DISTRIBUTION ===")
-velocities = [m["velocity"] for m in metrics.movements]
-if velocities:
-    print(f"Min velocity: {min(velocities):.2f} px/s")
-    print(f"25th percentile: {np.percentile(velocities, 25):.2f} px/s")
-    print(f"Median velocity: {np.percentile(velocities, 50):.2f} px/s")
-    print(f"75th percentile: {np.percentile(velocities, 75):.2f} px/s")
-    print(f"95th percentile: {np.percentile(velocities, 95):.2f} px/s")
-    print(f"Max velocity: {max(velocities):.2f} px/s")
+velocities = metrics.movements["velocity"]
+if velocities.size:
+    # All quartiles from a single sort
+    p25, p50, p75, p95 = np.percentile(velocities, [25, 50, 75, 95])
+    print(f"Min velocity: {velocities.min():.2f} px/s")
+    print(f"25th percentile: {p25:.2f} px/s")
+    print(f"Median velocity: {p50:.2f} px/s")
+    print(f"75th percentile: {p75:.2f} px/s")
+    print(f"95th percentile: {p95:.2f} px/s")
+    print(f"Max velocity: {velocities.max():.2f} px/s")
 
 # Check flicks at different thresholds
 print("\n=== FLICK DETECTION AT DIFFERENT THRESHOLDS ===")
-for threshold in [100, 200, 300, 500, 750, 1000, 2000]:
-    flicks = metrics.detectFlicks(velocityThreshold=threshold)
-    print(f"Threshold {threshold:4d} px/s: {len(flicks):3d} flicks detected")
+# Flicks are movements with velocity > threshold, so every count comes from
+# one sort plus a binary search instead of building each flick list
+thresholds = np.array([100, 200, 300, 500, 750, 1000, 2000])
+flickCounts = velocities.size - np.searchsorted(np.sort(velocities), thresholds, side="right")
+for threshold, flickCount in zip(thresholds.tolist(), flickCounts.tolist()):
+    print(f"Threshold {threshold:4d} px/s: {flickCount:3d} flicks detected")
 
 # Save summary to JSON
-with open("analysis_summary.json", 'w') as f:
-    json.dump(summary, f, indent=2)
+saveJson(summary, "analysis_summary.json")
 
 print(f"\nSummary saved to analysis_summary.json")
\ No newline at end of file